@@ -4,6 +4,7 @@ TTS Benchmarking Tool - Streamlit Application
 import streamlit as st
 import asyncio
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import json
 import base64
@@ -34,9 +35,14 @@ st.set_page_config(
 )
 
 # Load external CSS
-def load_css():
+@st.cache_data
+def _read_css() -> str:
     with open('styles.css', 'r') as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+        return f.read()
+
+def load_css():
+    # Cache the file read so every rerun doesn't hit the filesystem
+    st.markdown(f'<style>{_read_css()}</style>', unsafe_allow_html=True)
 
 # Apply custom styles
 load_css()
@@ -87,6 +93,16 @@ def check_configuration():
     st.session_state.config_valid = config_status["valid"]
     return config_status
 
+@st.cache_resource
+def get_provider(provider_id: str):
+    """Create and reuse a single TTS provider client per provider
+
+    Provider construction pulls in the SDK import chain and session setup;
+    st.cache_resource keeps the non-serializable client alive across reruns
+    instead of rebuilding it for every generation.
+    """
+    return TTSProviderFactory.create_provider(provider_id)
+
 def main():
     """Main application function"""
     
@@ -132,12 +148,18 @@ def main():
         else:
             st.error("No API keys configured")
             st.markdown("**Set at least one API key:**")
-            for provider_id, status in config_status["providers"].items():
-                if not status["configured"]:
-                    env_var = TTS_PROVIDERS[provider_id].api_key_env
-                    provider_name = TTS_PROVIDERS[provider_id].name
-                    st.code(f"export {env_var}=your_api_key_here")
-                    st.caption(f"For {provider_name}")
+            # Render one consolidated code block instead of a code/caption
+            # element pair per provider - every st.* call is a separate
+            # element Streamlit has to serialize and diff
+            unconfigured = [
+                provider_id for provider_id, status in config_status["providers"].items()
+                if not status["configured"]
+            ]
+            st.code("\n".join(
+                f"export {TTS_PROVIDERS[provider_id].api_key_env}=your_api_key_here"
+                for provider_id in unconfigured
+            ))
+            st.caption("For " + ", ".join(TTS_PROVIDERS[provider_id].name for provider_id in unconfigured))
         
         st.divider()
     
@@ -512,31 +534,19 @@ def blind_test_page():
     default_text = st.session_state.sentence_cache[visit_key]
     
     st.write("")  # Add spacing
-    
-    # Text input with multilingual support
-    # Use key that changes when language changes to force update
-    text_input = st.text_area(
-        "Enter text to test:",
-        value=default_text,
-        height=120,
-        max_chars=5000,
-        key=f"text_input_{language}"
-    )
-    
-    char_count = len(text_input)
-    st.caption(f"Characters: {char_count}/5000")
-    
-    st.write("")  # Add spacing
-    
-    # Provider selection for blind test
+
+    # Provider selection for blind test - kept OUTSIDE the form: widgets
+    # that aren't rendered on a run lose their state inside a form, so a
+    # radio flip plus immediate submit would consume selectbox defaults
+    # the user was never shown
     st.subheader("Provider Selection")
-    
+
     # Get provider display names
     provider_display_names = {
-        provider_id: TTS_PROVIDERS[provider_id].name 
+        provider_id: TTS_PROVIDERS[provider_id].name
         for provider_id in configured_providers
     }
-    
+
     # Determine number of providers to compare
     num_providers_to_compare = st.radio(
         "Number of providers to compare:",
@@ -544,7 +554,7 @@ def blind_test_page():
         key="num_providers_radio",
         horizontal=True
     )
-    
+
     # Select which providers to compare
     selected_providers = []
     if num_providers_to_compare == "All 3" and len(configured_providers) >= 3:
@@ -555,7 +565,7 @@ def blind_test_page():
         # Let user select 2 providers - show only display names
         provider_options = [provider_display_names[p] for p in configured_providers]
         provider_id_map = {provider_display_names[p]: p for p in configured_providers}
-        
+
         col1, col2 = st.columns(2)
         with col1:
             provider1_name = st.selectbox(
@@ -571,7 +581,7 @@ def blind_test_page():
                 provider2_options,
                 key="provider2_select"
             )
-        
+
         # Map display names back to provider IDs
         provider1_id = provider_id_map[provider1_name]
         provider2_id = provider_id_map[provider2_name]
@@ -580,20 +590,44 @@ def blind_test_page():
         # Only one provider available
         selected_providers = configured_providers
         st.info(f"Only 1 provider configured: {provider_display_names[configured_providers[0]]}")
-    
+
     st.write("")  # Add spacing
-    
+
+    # Group the text input in a form so editing it doesn't trigger a full
+    # script rerun - the script only re-executes on submit
+    with st.form("blind_test_form"):
+        # Text input with multilingual support
+        # Use key that changes when language changes to force update
+        text_input = st.text_area(
+            "Enter text to test:",
+            value=default_text,
+            height=120,
+            max_chars=5000,
+            key=f"text_input_{language}"
+        )
+
+        char_count = len(text_input)
+        st.caption(f"Characters: {char_count}/5000")
+
+        st.write("")  # Add spacing
+
+        submitted = st.form_submit_button("Generate Blind Test", type="primary")
+
     # Generate blind test samples
-    if st.button("Generate Blind Test", type="primary"):
-        if text_input and len(selected_providers) >= 1:
+    if submitted:
+        if not text_input or len(selected_providers) < 1:
+            st.error("Please enter text and ensure at least 1 provider is selected.")
+        elif len(set(selected_providers)) != len(selected_providers):
+            # The live widgets filter provider1 out of provider2's options,
+            # but keep a last-resort guard against stale widget state
+            st.error("Please select two different providers.")
+        else:
             # Validate input
             valid, error_msg = session_manager.validate_request(text_input)
             if valid:
                 generate_blind_test_samples(text_input, selected_providers, language)
             else:
                 st.error(f"ERROR: {error_msg}")
-        else:
-            st.error("Please enter text and ensure at least 1 provider is selected.")
     
     # Display blind test samples if available
     if st.session_state.blind_test_samples:
@@ -655,7 +689,7 @@ def generate_blind_test_samples(text: str, providers: List[str], language: str):
     
     async def test_provider(provider_id: str):
         try:
-            provider = TTSProviderFactory.create_provider(provider_id)
+            provider = get_provider(provider_id)
             provider_name = TTS_PROVIDERS[provider_id].name
             
             # Check if this provider has voices mapped for the selected language
@@ -747,87 +781,95 @@ def generate_blind_test_samples(text: str, providers: List[str], language: str):
     
     st.rerun()
 
-def display_blind_test_samples():
-    """Display blind test samples for voting"""
-    
-    samples = st.session_state.blind_test_samples
-    
-    if not st.session_state.blind_test_voted:
-        # Voting phase - don't reveal providers
-        st.subheader("Listen and Vote")
-        st.markdown("**Listen to each sample and vote for the one with the best quality:**")
-        
-        # Display samples in rows of 4
-        for i in range(0, len(samples), 4):
-            cols = st.columns(4)
-            for j, result in enumerate(samples[i:i+4]):
-                with cols[j]:
-                    st.markdown(f"### Sample {result.blind_label}")
+@st.fragment
+def _blind_test_voting_block(samples):
+    """Audio playback and voting section, scoped to a fragment so that
+    interacting with the vote widgets reruns only this block instead of
+    the whole script (sidebar, config checks, page router)"""
+
+    # Voting phase - don't reveal providers
+    st.subheader("Listen and Vote")
+    st.markdown("**Listen to each sample and vote for the one with the best quality:**")
+    
+    # Display samples in rows of 4
+    for i in range(0, len(samples), 4):
+        cols = st.columns(4)
+        for j, result in enumerate(samples[i:i+4]):
+            with cols[j]:
+                st.markdown(f"### Sample {result.blind_label}")
+                
+                if result.audio_data:
+                    # Custom audio player without download option in 3-dot menu
+                    audio_base64 = base64.b64encode(result.audio_data).decode()
+                    audio_html = f"""
+                    <audio controls controlsList="nodownload" style="width: 100%;">
+                        <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mpeg">
+                    </audio>
+                    """
+                    st.markdown(audio_html, unsafe_allow_html=True)
+                    st.caption(f"Sample {result.blind_label}")
                     
-                    if result.audio_data:
-                        # Custom audio player without download option in 3-dot menu
-                        audio_base64 = base64.b64encode(result.audio_data).decode()
-                        audio_html = f"""
-                        <audio controls controlsList="nodownload" style="width: 100%;">
-                            <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mpeg">
-                        </audio>
-                        """
-                        st.markdown(audio_html, unsafe_allow_html=True)
-                        st.caption(f"Sample {result.blind_label}")
-                        
-                        # Download button
-                        st.download_button(
-                            label="Download MP3",
-                            data=result.audio_data,
-                            file_name=f"sample_{result.blind_label}.mp3",
-                            mime="audio/mpeg",
-                            key=f"download_blind_{result.blind_label}_{i}_{j}"
-                        )
-        
-        st.divider()
+                    # Download button
+                    st.download_button(
+                        label="Download MP3",
+                        data=result.audio_data,
+                        file_name=f"sample_{result.blind_label}.mp3",
+                        mime="audio/mpeg",
+                        key=f"download_blind_{result.blind_label}_{i}_{j}"
+                    )
+    
+    st.divider()
+    
+    # Voting section
+    st.markdown("### Cast Your Vote")
+    
+    vote_options = [f"Sample {r.blind_label}" for r in samples]
+    selected_sample = st.radio(
+        "Which sample sounds best to you?",
+        vote_options,
+        key="blind_vote_radio"
+    )
+    
+    if st.button("Submit Vote", type="primary"):
+        # Record vote
+        selected_label = selected_sample.split()[1]  # Extract label (A, B, C, etc.)
+        st.session_state.blind_test_vote_choice = selected_label
+        st.session_state.blind_test_voted = True
         
-        # Voting section
-        st.markdown("### Cast Your Vote")
+        # Find the winning sample
+        winner_result = next(r for r in samples if r.blind_label == selected_label)
         
-        vote_options = [f"Sample {r.blind_label}" for r in samples]
-        selected_sample = st.radio(
-            "Which sample sounds best to you?",
-            vote_options,
-            key="blind_vote_radio"
-        )
+        # Get language from session state
+        language = st.session_state.get("blind_test_language", "all")
         
-        if st.button("Submit Vote", type="primary"):
-            # Record vote
-            selected_label = selected_sample.split()[1]  # Extract label (A, B, C, etc.)
-            st.session_state.blind_test_vote_choice = selected_label
-            st.session_state.blind_test_voted = True
-            
-            # Find the winning sample
-            winner_result = next(r for r in samples if r.blind_label == selected_label)
-            
-            # Get language from session state
-            language = st.session_state.get("blind_test_language", "all")
+        # Update ELO ratings - winner beats all others
+        # For multi-provider tests, update ELO for all comparisons but count each provider only once
+        losers = [r for r in samples if r.blind_label != selected_label]
+        if losers:
+            # First, update ELO ratings for all comparisons (for rating accuracy)
+            # But don't increment games_played yet - we'll do that separately
+            for loser_result in losers:
+                handle_blind_test_vote(winner_result, loser_result, language, save_vote=False, increment_games=False)
             
-            # Update ELO ratings - winner beats all others
-            # For multi-provider tests, update ELO for all comparisons but count each provider only once
-            losers = [r for r in samples if r.blind_label != selected_label]
-            if losers:
-                # First, update ELO ratings for all comparisons (for rating accuracy)
-                # But don't increment games_played yet - we'll do that separately
-                for loser_result in losers:
-                    handle_blind_test_vote(winner_result, loser_result, language, save_vote=False, increment_games=False)
-                
-                # Now increment games_played once per provider (each provider participated in 1 test)
-                # Winner won, all losers lost
-                db.increment_provider_games(winner_result.provider, won=True, language=language)
-                for loser_result in losers:
-                    db.increment_provider_games(loser_result.provider, won=False, language=language)
-                
-                # Save only one vote to database (for user voting statistics)
-                handle_blind_test_vote(winner_result, losers[0], language, save_vote=True, increment_games=False)
+            # Now increment games_played once per provider (each provider participated in 1 test)
+            # Winner won, all losers lost
+            db.increment_provider_games(winner_result.provider, won=True, language=language)
+            for loser_result in losers:
+                db.increment_provider_games(loser_result.provider, won=False, language=language)
             
-            st.rerun()
-    
+            # Save only one vote to database (for user voting statistics)
+            handle_blind_test_vote(winner_result, losers[0], language, save_vote=True, increment_games=False)
+
+        # Full-app rerun so the results phase outside the fragment renders
+        st.rerun(scope="app")
+
+def display_blind_test_samples():
+    """Display blind test samples for voting"""
+
+    samples = st.session_state.blind_test_samples
+
+    if not st.session_state.blind_test_voted:
+        _blind_test_voting_block(samples)
     else:
         # Results phase - reveal providers
         st.subheader("Results Revealed!")
@@ -843,19 +885,17 @@ def display_blind_test_samples():
         # Show all samples with revealed providers
         st.subheader("All Samples Revealed")
         
-        # Create comparison table
-        comparison_data = []
-        for result in sorted(samples, key=lambda r: r.blind_label):
-            is_winner = result.blind_label == st.session_state.blind_test_vote_choice
-            comparison_data.append({
-                "Sample": result.blind_label,
-                "Provider": result.provider.title(),
-                "Model": result.model_name,
-                "Location": get_location_display(result),
-                "Your Choice": "WINNER" if is_winner else ""
-            })
-        
-        df = pd.DataFrame(comparison_data)
+        # Create comparison table column-by-column so pandas skips the
+        # per-row dict unpacking and dtype re-inference
+        revealed = sorted(samples, key=lambda r: r.blind_label)
+        vote_choice = st.session_state.blind_test_vote_choice
+        df = pd.DataFrame({
+            "Sample": [r.blind_label for r in revealed],
+            "Provider": [r.provider.title() for r in revealed],
+            "Model": [r.model_name for r in revealed],
+            "Location": [get_location_display(r) for r in revealed],
+            "Your Choice": ["WINNER" if r.blind_label == vote_choice else "" for r in revealed]
+        })
         st.dataframe(df, use_container_width=True, hide_index=True)
         
         # Show audio samples with labels
@@ -946,16 +986,113 @@ def handle_blind_test_vote(winner_result: BenchmarkResult, loser_result: Benchma
                 session_id="blind_test_session",
                 language=language
             )
-        
+
+        # Ratings changed - drop the cached leaderboard table/chart
+        _build_leaderboard_df.clear()
+        _build_leaderboard_chart.clear()
+
     except Exception as e:
         st.error(f"Error updating ratings: {e}")
 
+# Leaderboard entries arrive as a list of dicts, which st.cache_data can't hash
+# natively - hash on the fields that change when ratings move
+_LEADERBOARD_HASH_FUNCS = {
+    list: lambda L: tuple((e["provider"], e["elo_rating"], e["games_played"]) for e in L)
+}
+
+@st.cache_data(ttl=30, hash_funcs=_LEADERBOARD_HASH_FUNCS)
+def _build_leaderboard_df(leaderboard: List[Dict[str, Any]], location_display: str) -> pd.DataFrame:
+    """Build the formatted leaderboard table, cached so post-vote refreshes
+    with unchanged ratings are O(1)"""
+    df_leaderboard = pd.DataFrame(leaderboard)
+    df_leaderboard["Provider"] = df_leaderboard["provider"].str.title()
+
+    # Add model names and location
+    df_leaderboard["Model"] = df_leaderboard["provider"].apply(get_model_name)
+    df_leaderboard["Location"] = location_display
+
+    # Format the display columns (removed ELO, TTFB columns)
+    display_df = df_leaderboard[[
+        "rank", "Provider", "Model", "Location",
+        "games_played", "wins", "losses", "win_rate"
+    ]].copy()
+
+    # Ensure numeric types
+    display_df["games_played"] = pd.to_numeric(display_df["games_played"], errors='coerce').fillna(0)
+    display_df["wins"] = pd.to_numeric(display_df["wins"], errors='coerce').fillna(0)
+    display_df["losses"] = pd.to_numeric(display_df["losses"], errors='coerce').fillna(0)
+
+    # Each provider already has correct count (1 per test they participated in)
+    # No division needed - games_played already represents the number of tests
+    display_df["Total Tests"] = display_df["games_played"].astype(int)
+    display_df["Wins"] = display_df["wins"].astype(int)
+    display_df["Losses"] = display_df["losses"].astype(int)
+
+    # Ensure win_rate is numeric
+    display_df["win_rate"] = pd.to_numeric(display_df["win_rate"], errors='coerce').fillna(0.0)
+
+    display_df = display_df[[
+        "rank", "Provider", "Model", "Location",
+        "Total Tests", "Wins", "Losses", "win_rate"
+    ]].copy()
+
+    display_df.columns = [
+        "Rank", "Provider", "Model", "Location",
+        "Total Tests", "Wins", "Losses", "Win Rate %"
+    ]
+
+    # Format win_rate as percentage string for display
+    display_df["Win Rate %"] = display_df["Win Rate %"].apply(lambda x: f"{x:.1f}%")
+
+    return display_df
+
+@st.cache_data(ttl=30, hash_funcs=_LEADERBOARD_HASH_FUNCS)
+def _build_leaderboard_chart(leaderboard: List[Dict[str, Any]]):
+    """Build the leaderboard chart, cached alongside the table"""
+    return visualizations.create_leaderboard_chart(leaderboard)
+
+@st.cache_data(ttl=30)
+def _build_vote_stats(fingerprint: tuple, language: str, location_display: str):
+    """Build the user-vote statistics table, keyed on a cheap DB fingerprint
+    (vote count + latest timestamp) so reruns with no new votes skip the
+    query and DataFrame rebuild entirely"""
+    # Wins, losses and win rate are aggregated in a single SQL query -
+    # Python just relabels the ready-made table
+    rates = db.get_vote_win_rates(language)
+
+    total_votes = int(rates['wins'].sum()) if not rates.empty else 0
+    if total_votes == 0:
+        return total_votes, pd.DataFrame()
+
+    # Keep only providers that actually won votes, matching the previous display
+    rates = rates[rates['wins'] > 0]
+
+    vote_df = pd.DataFrame({
+        "Provider": rates['provider'].str.title(),
+        "Model": rates['provider'].map(get_model_name),
+        "Location": location_display,
+        "User Votes Won": rates['wins'].astype(np.int32),
+        "User Win Rate %": rates['win_rate'].astype(np.float32)
+    })
+
+    return total_votes, vote_df
+
 def leaderboard_page():
     """ELO leaderboard page with persistent data, broken down by language"""
-    
+
     st.header("Leaderboard")
     st.markdown("Rankings of TTS providers by language")
-    
+
+    _leaderboard_content()
+
+@st.fragment
+def _leaderboard_content():
+    """Rankings, charts and vote statistics, scoped as a fragment
+
+    Changing the language filter reruns only this block instead of the
+    whole script, so the sidebar config checks and page chrome are not
+    rebuilt on every selection.
+    """
     # Language selection for leaderboard
     available_languages = ["All Languages", "Tamil", "Telugu", "Kannada", "Marathi", "Punjabi", "Bengali", "English-India", "Hindi"]
     
@@ -1005,88 +1142,38 @@ def leaderboard_page():
     
     # Display leaderboard chart
     try:
-        fig_leaderboard = visualizations.create_leaderboard_chart(leaderboard)
+        fig_leaderboard = _build_leaderboard_chart(leaderboard)
         st.plotly_chart(fig_leaderboard, use_container_width=True)
     except:
         # Fallback if visualization fails
         pass
-    
+
     # Leaderboard table
     st.subheader("Current Rankings")
-    
+
     # Get current location for display
     current_location = geo_service.get_location_string()
     location_display = f"{geo_service.get_country_flag()} {current_location}"
-    
-    df_leaderboard = pd.DataFrame(leaderboard)
-    df_leaderboard["Provider"] = df_leaderboard["provider"].str.title()
-    
-    # Add model names and location
-    df_leaderboard["Model"] = df_leaderboard["provider"].apply(get_model_name)
-    df_leaderboard["Location"] = location_display
-    
-    # Format the display columns (removed ELO, TTFB columns)
-    display_df = df_leaderboard[[
-        "rank", "Provider", "Model", "Location",
-        "games_played", "wins", "losses", "win_rate"
-    ]].copy()
-    
-    # Ensure numeric types
-    display_df["games_played"] = pd.to_numeric(display_df["games_played"], errors='coerce').fillna(0)
-    display_df["wins"] = pd.to_numeric(display_df["wins"], errors='coerce').fillna(0)
-    display_df["losses"] = pd.to_numeric(display_df["losses"], errors='coerce').fillna(0)
-    
-    # Each provider already has correct count (1 per test they participated in)
-    # No division needed - games_played already represents the number of tests
-    display_df["Total Tests"] = display_df["games_played"].astype(int)
-    display_df["Wins"] = display_df["wins"].astype(int)
-    display_df["Losses"] = display_df["losses"].astype(int)
-    
-    # Ensure win_rate is numeric
-    display_df["win_rate"] = pd.to_numeric(display_df["win_rate"], errors='coerce').fillna(0.0)
-    
-    display_df = display_df[[
-        "rank", "Provider", "Model", "Location",
-        "Total Tests", "Wins", "Losses", "win_rate"
-    ]].copy()
-    
-    display_df.columns = [
-        "Rank", "Provider", "Model", "Location",
-        "Total Tests", "Wins", "Losses", "Win Rate %"
-    ]
-    
-    # Format win_rate as percentage string for display
-    display_df["Win Rate %"] = display_df["Win Rate %"].apply(lambda x: f"{x:.1f}%")
-    
+
+    display_df = _build_leaderboard_df(leaderboard, location_display)
+
     st.dataframe(display_df, use_container_width=True, hide_index=True)
     
     # User voting statistics for selected language
     st.subheader(f"User Voting Statistics{' - ' + selected_language if selected_language != 'All Languages' else ''}")
-    vote_stats = db.get_vote_statistics(db_language)
-    
-    if vote_stats['total_votes'] > 0:
-        st.metric("Total User Votes", vote_stats['total_votes'])
-        
-        # Show vote wins per provider
-        if vote_stats['wins']:
-            vote_data = []
-            location_display = f"{geo_service.get_country_flag()} {geo_service.get_location_string()}"
-            
-            for provider, wins in vote_stats['wins'].items():
-                losses = vote_stats['losses'].get(provider, 0)
-                total = wins + losses
-                win_rate = (wins / total * 100) if total > 0 else 0
-                
-                vote_data.append({
-                    "Provider": provider.title(),
-                    "Model": get_model_name(provider),
-                    "Location": location_display,
-                    "User Votes Won": wins,
-                    "User Win Rate %": f"{win_rate:.1f}%"
-                })
-            
-            vote_df = pd.DataFrame(vote_data)
-            st.dataframe(vote_df, use_container_width=True, hide_index=True)
+    total_votes, vote_df = _build_vote_stats(db.get_votes_fingerprint(), db_language, location_display)
+
+    if total_votes > 0:
+        st.metric("Total User Votes", total_votes)
+
+        # Show vote wins per provider - format the rate only for presentation
+        # so the underlying column stays numeric
+        if not vote_df.empty:
+            st.dataframe(
+                vote_df.style.format({"User Win Rate %": "{:.1f}%"}),
+                use_container_width=True,
+                hide_index=True
+            )
     else:
         st.info("No user votes yet. Vote in Blind Test to start building preference data!")
 
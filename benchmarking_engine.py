@@ -2,23 +2,61 @@
 Benchmarking engine for TTS providers
 """
 import asyncio
+import csv
 import time
-import statistics
+from array import array
+from collections import Counter
 from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 import json
 from datetime import datetime
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from scipy import stats as scipy_stats
+except ImportError:
+    scipy_stats = None
+import numpy as np
 import pandas as pd
 
 from tts_providers import TTSProvider, TTSRequest, TTSResult, TTSProviderFactory
 from dataset import TestSample, DatasetGenerator
-from config import BENCHMARK_CONFIG
+from config import BENCHMARK_CONFIG, TTS_PROVIDERS
 from database import db
 from geolocation import geo_service
 
-@dataclass
+# Where suite runs spill generated audio so results don't retain the bytes
+AUDIO_CACHE_DIR = Path("audio_cache")
+
+def _latency_profile(latencies: np.ndarray) -> Tuple[float, float, float, float, float]:
+    """Mean plus p50/p90/p95/p99 fused over one sorted copy of the array
+
+    Shared by every summary path so each provider's latencies are sorted
+    exactly once per aggregation.
+    """
+    ordered = np.sort(latencies)
+    n = ordered.size
+
+    def quantile(p: float) -> float:
+        index = (p / 100) * (n - 1)
+        lower = int(index)
+        upper = min(lower + 1, n - 1)
+        return float(ordered[lower] + (ordered[upper] - ordered[lower]) * (index - lower))
+
+    return float(ordered.mean()), quantile(50), quantile(90), quantile(95), quantile(99)
+
+@dataclass(slots=True)
 class BenchmarkResult:
-    """Result from a single benchmark test"""
+    """Result from a single benchmark test
+
+    slots=True removes the per-instance __dict__; any field set after
+    construction (like blind_label) must be declared here.
+    """
     test_id: str
     provider: str
     sample_id: str
@@ -32,6 +70,7 @@ class BenchmarkResult:
     metadata: Dict[str, Any]
     iteration: int
     audio_data: Optional[bytes] = None
+    audio_path: str = ""  # On-disk audio location when spilled from memory
     sample: Optional[TestSample] = None
     model_name: str = ""  # Full model name for display
     location_country: str = ""  # Country where test was run
@@ -39,8 +78,9 @@ class BenchmarkResult:
     location_region: str = ""  # Region/State where test was run
     latency_1: float = 0.0  # Network latency (pure RTT) without TTS processing
     ttfb: float = 0.0  # Time to First Byte (network + initial processing)
+    blind_label: str = ""  # Anonymous label assigned during blind tests
 
-@dataclass
+@dataclass(slots=True)
 class BenchmarkSummary:
     """Summary statistics for benchmark results"""
     provider: str
@@ -55,7 +95,7 @@ class BenchmarkSummary:
     total_errors: int
     error_types: Dict[str, int]
 
-@dataclass
+@dataclass(slots=True)
 class ComparisonResult:
     """Result from comparing two providers"""
     provider_a: str
@@ -74,7 +114,18 @@ class BenchmarkEngine:
         self.providers = TTSProviderFactory.create_all_providers()
         self.dataset_generator = DatasetGenerator()
         self.results: List[BenchmarkResult] = []
-        
+        # Per-provider running accumulators, folded in as each test
+        # completes so summaries don't have to rescan self.results
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+        # Location and model names don't change during a suite - resolve
+        # them once here instead of on every test
+        self._location = geo_service.get_location()
+        self._model_names = {
+            provider_id: TTS_PROVIDERS[provider_id].model_name if provider_id in TTS_PROVIDERS else provider_id
+            for provider_id in self.providers
+        }
+
         # Initialize ELO ratings in database
         for provider_id in self.providers.keys():
             db.init_elo_rating(provider_id, BENCHMARK_CONFIG["initial_elo_rating"])
@@ -85,9 +136,17 @@ class BenchmarkEngine:
         sample: TestSample,
         voice: str,
         iteration: int = 1,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        save_to_db: bool = True,
+        spill_audio: bool = False
     ) -> BenchmarkResult:
-        """Run a single TTS test"""
+        """Run a single TTS test
+
+        save_to_db=False skips the per-test insert so suite runs can batch
+        all results into one bulk write at the end. spill_audio=True writes
+        the generated audio to disk and keeps only its path, so long suites
+        don't hold every payload in memory.
+        """
         
         # Measure network latency (pure RTT without TTS processing)
         ping_latency = await provider.measure_ping_latency()
@@ -111,12 +170,21 @@ class BenchmarkEngine:
             estimated_ttfb = ping_latency + (processing_time * 0.15)  # 15% of processing for first byte
             ttfb_value = max(ping_latency + 10, estimated_ttfb)  # At least ping + 10ms
         
-        # Get model name from config
-        from config import TTS_PROVIDERS
-        model_name = TTS_PROVIDERS.get(provider.provider_id).model_name if provider.provider_id in TTS_PROVIDERS else provider.provider_id
-        
-        # Get geolocation
-        location = geo_service.get_location()
+        # Model name and geolocation are cached on the engine
+        model_name = self._model_names.get(provider.provider_id, provider.provider_id)
+        location = self._location
+
+        # Extend the provider's metadata dict in place rather than
+        # splat-copying it - it's freshly built per generation
+        metadata = result.metadata if result.metadata is not None else {}
+        metadata.update(
+            word_count=sample.word_count,
+            category=sample.category,
+            length_category=sample.length_category,
+            complexity_score=sample.complexity_score,
+            # Classified once here so stats passes don't re-split the message
+            error_category='' if result.success else (result.error_message or '').partition(':')[0]
+        )
         
         # Create benchmark result
         benchmark_result = BenchmarkResult(
@@ -130,13 +198,7 @@ class BenchmarkEngine:
             file_size_bytes=result.file_size_bytes,
             error_message=result.error_message,
             timestamp=datetime.now().isoformat(),
-            metadata={
-                **result.metadata,
-                "word_count": sample.word_count,
-                "category": sample.category,
-                "length_category": sample.length_category,
-                "complexity_score": sample.complexity_score
-            },
+            metadata=metadata,
             iteration=iteration,
             audio_data=result.audio_data,
             sample=sample,
@@ -148,11 +210,18 @@ class BenchmarkEngine:
             ttfb=ttfb_value
         )
         
-        # Save to database
-        try:
+        if spill_audio and benchmark_result.audio_data:
+            # Write off the event loop - a blocking disk flush here would
+            # stall every other in-flight test and skew their latency
+            # measurements
+            await asyncio.to_thread(self._spill_audio, benchmark_result)
+
+        self._record_stats(benchmark_result)
+
+        # Save to database; the enqueue never raises - failures are
+        # reported by the background writer when the batch lands
+        if save_to_db:
             db.save_benchmark_result(benchmark_result)
-        except Exception as e:
-            print(f"Warning: Failed to save result to database: {e}")
         
         return benchmark_result
     
@@ -164,120 +233,264 @@ class BenchmarkEngine:
         iterations: int = 3,
         progress_callback: Optional[callable] = None
     ) -> List[BenchmarkResult]:
-        """Run comprehensive benchmark suite"""
-        
+        """Run comprehensive benchmark suite
+
+        Tests run concurrently: every (provider, sample, voice, iteration)
+        combination becomes a task, with a per-provider semaphore capping
+        in-flight requests so no provider gets hammered past its rate limit.
+        """
         results = []
-        total_tests = sum(len(samples) * len(voices_per_provider.get(p, [])) * iterations for p in providers)
         completed_tests = 0
-        
+
+        plan = self._build_test_plan(providers, samples, voices_per_provider, iterations)
+        total_tests = len(plan)
+
+        try:
+            async for result in self._iter_plan(plan):
+                results.append(result)
+
+                completed_tests += 1
+                if progress_callback:
+                    progress_callback(completed_tests, total_tests)
+        finally:
+            # One bulk insert for the whole suite instead of a DB round-trip
+            # per test; flushed even if the suite aborts partway
+            try:
+                db.save_benchmark_results(results)
+            except Exception as e:
+                print(f"Warning: Failed to save results to database: {e}")
+
+        self.results.extend(results)
+        return results
+
+    def _build_test_plan(
+        self,
+        providers: List[str],
+        samples: List[TestSample],
+        voices_per_provider: Dict[str, List[str]],
+        iterations: int
+    ) -> List[tuple]:
+        """Expand the flat (provider, sample, voice, iteration) test plan
+
+        Resolves each provider's voice list exactly once up front -
+        dict.get evaluates its default eagerly, so leaving the
+        get_available_voices() call inline would re-query voices for every
+        sample even when an explicit list was passed. The plan length
+        counts exactly the tests that will run (unavailable providers
+        excluded, default voices resolved).
+        """
+        voices_by_provider = {}
         for provider_id in providers:
             if provider_id not in self.providers:
                 print(f"Provider {provider_id} not available, skipping...")
                 continue
-            
-            provider = self.providers[provider_id]
-            voices = voices_per_provider.get(provider_id, provider.get_available_voices()[:1])
-            
-            for sample in samples:
-                for voice in voices:
-                    for iteration in range(1, iterations + 1):
-                        try:
-                            result = await self.run_single_test(
-                                provider, sample, voice, iteration
-                            )
-                            results.append(result)
-                            
-                            completed_tests += 1
-                            if progress_callback:
-                                progress_callback(completed_tests, total_tests)
-                            
-                            # Small delay to avoid rate limiting
-                            await asyncio.sleep(0.1)
-                            
-                        except Exception as e:
-                            error_result = BenchmarkResult(
-                                test_id=f"{provider_id}_{sample.id}_{iteration}",
-                                provider=provider_id,
-                                sample_id=sample.id,
-                                text=sample.text,
-                                voice=voice,
-                                success=False,
-                                latency_ms=0,
-                                file_size_bytes=0,
-                                error_message=f"Benchmark error: {str(e)}",
-                                timestamp=datetime.now().isoformat(),
-                                metadata={"iteration": iteration},
-                                iteration=iteration
-                            )
-                            results.append(error_result)
-                            completed_tests += 1
-                            
-                            if progress_callback:
-                                progress_callback(completed_tests, total_tests)
-        
-        self.results.extend(results)
-        return results
-    
+            voices = voices_per_provider.get(provider_id)
+            if voices is None:
+                voices = self.providers[provider_id].get_available_voices()[:1]
+            voices_by_provider[provider_id] = voices
+
+        return [
+            (provider_id, self.providers[provider_id], sample, voice, iteration)
+            for provider_id, provider_voices in voices_by_provider.items()
+            for sample in samples
+            for voice in provider_voices
+            for iteration in range(1, iterations + 1)
+        ]
+
+    async def iter_benchmark(
+        self,
+        providers: List[str],
+        samples: List[TestSample],
+        voices_per_provider: Dict[str, List[str]],
+        iterations: int = 3
+    ):
+        """Yield benchmark results as each test completes
+
+        Streaming counterpart to run_benchmark_suite: callers can log,
+        export or summarize partial results while later tests are still in
+        flight instead of waiting for the whole suite. Results are not
+        persisted or accumulated on the engine here - that stays the
+        caller's choice.
+        """
+        plan = self._build_test_plan(providers, samples, voices_per_provider, iterations)
+        async for result in self._iter_plan(plan):
+            yield result
+
+    async def _iter_plan(self, plan: List[tuple]):
+        """Run a prepared test plan, yielding results in completion order"""
+        concurrency = BENCHMARK_CONFIG.get("max_concurrent_requests", 8)
+        semaphores = {provider_id: asyncio.Semaphore(concurrency)
+                      for provider_id in {job[0] for job in plan}}
+
+        async def run_limited(provider_id, provider, sample, voice, iteration):
+            async with semaphores[provider_id]:
+                try:
+                    return await self.run_single_test(
+                        provider, sample, voice, iteration,
+                        save_to_db=False, spill_audio=True
+                    )
+                except Exception as e:
+                    error_result = BenchmarkResult(
+                        test_id=f"{provider_id}_{sample.id}_{iteration}",
+                        provider=provider_id,
+                        sample_id=sample.id,
+                        text=sample.text,
+                        voice=voice,
+                        success=False,
+                        latency_ms=0,
+                        file_size_bytes=0,
+                        error_message=f"Benchmark error: {str(e)}",
+                        timestamp=datetime.now().isoformat(),
+                        metadata={"iteration": iteration, "error_category": "Benchmark error"},
+                        iteration=iteration
+                    )
+                    self._record_stats(error_result)
+                    return error_result
+
+        tasks = [asyncio.create_task(run_limited(*job)) for job in plan]
+        for future in asyncio.as_completed(tasks):
+            yield await future
+
+    def _spill_audio(self, result: BenchmarkResult):
+        """Persist a result's audio to disk and drop the in-memory bytes"""
+        AUDIO_CACHE_DIR.mkdir(exist_ok=True)
+        path = AUDIO_CACHE_DIR / f"{result.test_id}.bin"
+        path.write_bytes(result.audio_data)
+        result.audio_path = str(path)
+        result.audio_data = None
+
+    def load_audio(self, test_id: str) -> Optional[bytes]:
+        """Read spilled audio for a test back from the cache directory"""
+        path = AUDIO_CACHE_DIR / f"{test_id}.bin"
+        return path.read_bytes() if path.exists() else None
+
+    def _record_stats(self, result: BenchmarkResult):
+        """Fold a result into the per-provider running accumulators
+
+        Latencies are kept in a compact float array (no result objects or
+        audio payloads retained), so running summaries stay cheap no matter
+        how many tests have completed.
+        """
+        stats = self._stats.setdefault(result.provider, {
+            "n": 0,
+            "n_ok": 0,
+            "latencies": array('d'),
+            "file_size_sum": 0.0,
+            "errors": Counter()
+        })
+        stats["n"] += 1
+        if result.success:
+            stats["n_ok"] += 1
+            stats["latencies"].append(result.latency_ms)
+            stats["file_size_sum"] += result.file_size_bytes
+        elif result.error_message:
+            # partition stops at the first separator without building a list
+            stats["errors"][result.error_message.partition(':')[0]] += 1
+
+    def get_running_summaries(self) -> Dict[str, BenchmarkSummary]:
+        """Summaries from the running accumulators
+
+        O(#providers) bookkeeping plus one numpy percentile pass over each
+        provider's latency array - self.results is never rescanned.
+        """
+        summaries = {}
+        for provider, stats in self._stats.items():
+            n_ok = stats["n_ok"]
+            if n_ok:
+                latencies = np.frombuffer(stats["latencies"], dtype=np.float64)
+                avg_latency, p50, p90, p95, p99 = _latency_profile(latencies)
+                avg_file_size = stats["file_size_sum"] / n_ok
+            else:
+                p50 = p90 = p95 = p99 = avg_latency = avg_file_size = 0.0
+
+            summaries[provider] = BenchmarkSummary(
+                provider=provider,
+                total_tests=stats["n"],
+                success_rate=n_ok / stats["n"] * 100,
+                avg_latency_ms=avg_latency,
+                median_latency_ms=float(p50),
+                p90_latency_ms=float(p90),
+                p95_latency_ms=float(p95),
+                p99_latency_ms=float(p99),
+                avg_file_size_bytes=avg_file_size,
+                total_errors=stats["n"] - n_ok,
+                error_types=dict(stats["errors"])
+            )
+
+        return summaries
+
     def calculate_summary_stats(self, results: List[BenchmarkResult]) -> Dict[str, BenchmarkSummary]:
-        """Calculate summary statistics for benchmark results"""
-        
+        """Calculate summary statistics for benchmark results
+
+        Built on one DataFrame and pandas groupby kernels so the grouping,
+        means and percentiles all run in compiled code rather than
+        per-provider Python loops.
+        """
+        if not results:
+            return {}
+
+        n = len(results)
+        df = pd.DataFrame({
+            "provider": [r.provider for r in results],
+            "latency_ms": np.fromiter((r.latency_ms for r in results), dtype=np.float64, count=n),
+            "file_size_bytes": np.fromiter((r.file_size_bytes for r in results), dtype=np.float64, count=n),
+            "success": np.fromiter((r.success for r in results), dtype=bool, count=n),
+            "error_message": [r.error_message for r in results]
+        })
+
+        totals = df.groupby("provider", sort=False).size()
+        ok_grp = df[df["success"]].groupby("provider", sort=False)
+        success_counts = ok_grp.size()
+        file_means = ok_grp["file_size_bytes"].mean()
+        # Mean and all four percentiles fused over one sort per provider
+        latency_profiles = {
+            provider: _latency_profile(group.to_numpy())
+            for provider, group in ok_grp["latency_ms"]
+        }
+
+        # Error-type counts: provider x first error-message segment
+        failed = df[~df["success"] & df["error_message"].notna()]
+        error_counts = (
+            failed.assign(error_type=failed["error_message"].str.split(':', n=1).str[0])
+            .groupby(["provider", "error_type"]).size()
+            if not failed.empty else pd.Series(dtype=np.int64)
+        )
+
         summaries = {}
-        
-        # Group results by provider
-        provider_results = {}
-        for result in results:
-            if result.provider not in provider_results:
-                provider_results[result.provider] = []
-            provider_results[result.provider].append(result)
-        
-        for provider, provider_results_list in provider_results.items():
-            successful_results = [r for r in provider_results_list if r.success]
-            
-            if not provider_results_list:
-                continue
-            
-            # Calculate latency statistics
-            latencies = [r.latency_ms for r in successful_results] if successful_results else [0]
-            file_sizes = [r.file_size_bytes for r in successful_results] if successful_results else [0]
-            
-            # Error analysis
-            error_types = {}
-            for result in provider_results_list:
-                if not result.success and result.error_message:
-                    error_type = result.error_message.split(':')[0]  # Get error type
-                    error_types[error_type] = error_types.get(error_type, 0) + 1
-            
-            summary = BenchmarkSummary(
+        for provider, total_tests in totals.items():
+            n_success = int(success_counts.get(provider, 0))
+            if n_success:
+                avg_latency, p50, p90, p95, p99 = latency_profiles[provider]
+                avg_file_size = float(file_means[provider])
+            else:
+                p50 = p90 = p95 = p99 = avg_latency = avg_file_size = 0.0
+
+            error_types = (
+                {etype: int(count) for etype, count in error_counts[provider].items()}
+                if provider in error_counts.index.get_level_values(0) else {}
+            ) if len(error_counts) else {}
+
+            summaries[provider] = BenchmarkSummary(
                 provider=provider,
-                total_tests=len(provider_results_list),
-                success_rate=len(successful_results) / len(provider_results_list) * 100,
-                avg_latency_ms=statistics.mean(latencies) if latencies else 0,
-                median_latency_ms=statistics.median(latencies) if latencies else 0,
-                p90_latency_ms=self._percentile(latencies, 90) if latencies else 0,
-                p95_latency_ms=self._percentile(latencies, 95) if latencies else 0,
-                p99_latency_ms=self._percentile(latencies, 99) if latencies else 0,
-                avg_file_size_bytes=statistics.mean(file_sizes) if file_sizes else 0,
-                total_errors=len(provider_results_list) - len(successful_results),
+                total_tests=int(total_tests),
+                success_rate=n_success / total_tests * 100,
+                avg_latency_ms=avg_latency,
+                median_latency_ms=float(p50),
+                p90_latency_ms=float(p90),
+                p95_latency_ms=float(p95),
+                p99_latency_ms=float(p99),
+                avg_file_size_bytes=avg_file_size,
+                total_errors=int(total_tests) - n_success,
                 error_types=error_types
             )
-            
-            summaries[provider] = summary
-        
+
         return summaries
     
-    def _percentile(self, data: List[float], percentile: int) -> float:
-        """Calculate percentile of data"""
-        if not data:
-            return 0
-        sorted_data = sorted(data)
-        index = (percentile / 100) * (len(sorted_data) - 1)
-        
-        if index.is_integer():
-            return sorted_data[int(index)]
-        else:
-            lower = sorted_data[int(index)]
-            upper = sorted_data[int(index) + 1]
-            return lower + (upper - lower) * (index - int(index))
+    def _percentile(self, data, percentiles: List[float]) -> List[float]:
+        """Calculate several percentiles of data from a single sorted copy"""
+        if len(data) == 0:
+            return [0.0] * len(percentiles)
+        return [float(p) for p in np.percentile(data, percentiles)]
     
     def compare_providers(
         self,
@@ -286,11 +499,27 @@ class BenchmarkEngine:
         results: List[BenchmarkResult]
     ) -> ComparisonResult:
         """Compare two providers statistically"""
-        
-        results_a = [r for r in results if r.provider == provider_a and r.success]
-        results_b = [r for r in results if r.provider == provider_b and r.success]
-        
-        if not results_a or not results_b:
+
+        # One pass over the results gathers everything both providers need
+        # instead of four separate filtered scans
+        agg = {
+            provider_a: {"n_total": 0, "latencies": array('d'), "file_size_sum": 0.0},
+            provider_b: {"n_total": 0, "latencies": array('d'), "file_size_sum": 0.0}
+        }
+        for result in results:
+            stats = agg.get(result.provider)
+            if stats is None:
+                continue
+            stats["n_total"] += 1
+            if result.success:
+                stats["latencies"].append(result.latency_ms)
+                stats["file_size_sum"] += result.file_size_bytes
+
+        stats_a = agg[provider_a]
+        stats_b = agg[provider_b]
+        latencies_a = np.frombuffer(stats_a["latencies"], dtype=np.float64)
+        latencies_b = np.frombuffer(stats_b["latencies"], dtype=np.float64)
+        if not len(latencies_a) or not len(latencies_b):
             return ComparisonResult(
                 provider_a=provider_a,
                 provider_b=provider_b,
@@ -301,16 +530,16 @@ class BenchmarkEngine:
                 statistical_significance=False,
                 confidence_level=0
             )
-        
+
         # Calculate metrics
-        latency_a = statistics.mean([r.latency_ms for r in results_a])
-        latency_b = statistics.mean([r.latency_ms for r in results_b])
-        
-        success_rate_a = len(results_a) / len([r for r in results if r.provider == provider_a]) * 100
-        success_rate_b = len(results_b) / len([r for r in results if r.provider == provider_b]) * 100
-        
-        file_size_a = statistics.mean([r.file_size_bytes for r in results_a])
-        file_size_b = statistics.mean([r.file_size_bytes for r in results_b])
+        latency_a = float(latencies_a.mean())
+        latency_b = float(latencies_b.mean())
+
+        success_rate_a = len(latencies_a) / stats_a["n_total"] * 100
+        success_rate_b = len(latencies_b) / stats_b["n_total"] * 100
+
+        file_size_a = stats_a["file_size_sum"] / len(latencies_a)
+        file_size_b = stats_b["file_size_sum"] / len(latencies_b)
         
         # Determine winner (lower latency wins, higher success rate wins)
         latency_score_a = 1 / latency_a if latency_a > 0 else 0
@@ -320,10 +549,19 @@ class BenchmarkEngine:
         combined_score_b = latency_score_b * (success_rate_b / 100)
         
         winner = provider_a if combined_score_a > combined_score_b else provider_b
-        
-        # Statistical significance (simplified t-test approximation)
+
         latency_improvement = ((latency_a - latency_b) / latency_a * 100) if latency_a > 0 else 0
-        
+
+        # Statistical significance via Welch's t-test when scipy is
+        # available; otherwise fall back to the old threshold heuristic
+        if scipy_stats is not None and len(latencies_a) > 1 and len(latencies_b) > 1:
+            _, p_value = scipy_stats.ttest_ind(latencies_a, latencies_b, equal_var=False)
+            statistical_significance = bool(p_value < 0.05)
+            confidence_level = float((1 - p_value) * 100)
+        else:
+            statistical_significance = abs(latency_improvement) > 5
+            confidence_level = 95.0 if abs(latency_improvement) > 10 else 80.0
+
         return ComparisonResult(
             provider_a=provider_a,
             provider_b=provider_b,
@@ -331,51 +569,49 @@ class BenchmarkEngine:
             latency_improvement_pct=abs(latency_improvement),
             success_rate_diff=abs(success_rate_a - success_rate_b),
             avg_file_size_diff_bytes=abs(file_size_a - file_size_b),
-            statistical_significance=abs(latency_improvement) > 5,  # Simplified threshold
-            confidence_level=95.0 if abs(latency_improvement) > 10 else 80.0
+            statistical_significance=statistical_significance,
+            confidence_level=confidence_level
         )
     
     def update_elo_ratings(self, results: List[BenchmarkResult]):
-        """Update ELO ratings based on head-to-head comparisons"""
-        
-        # Group results by sample for fair comparison
-        sample_results = {}
-        for result in results:
-            if result.success:  # Only consider successful results
-                if result.sample_id not in sample_results:
-                    sample_results[result.sample_id] = []
-                sample_results[result.sample_id].append(result)
-        
-        # Perform head-to-head comparisons
-        for sample_id, sample_results_list in sample_results.items():
-            if len(sample_results_list) < 2:
+        """Update ELO ratings based on head-to-head comparisons
+
+        Pairs are enumerated with a vectorized self-merge per sample rather
+        than nested Python loops, and all outcomes go to the database in one
+        bulk transaction instead of two UPDATEs per pair.
+        """
+        ok = [
+            (result.sample_id, result.provider, result.latency_ms)
+            for result in results if result.success
+        ]
+        if not ok:
+            return
+
+        df = pd.DataFrame(ok, columns=["sample_id", "provider", "latency_ms"])
+
+        # One argsort per sample ranks all providers at once; walking the
+        # sorted order emits each (winner, loser) pair directly without the
+        # doubled intermediate frame a self-merge would build
+        outcomes = []
+        for _, group in df.groupby("sample_id", sort=False):
+            if len(group) < 2:
                 continue
-            
-            # Compare all pairs
-            for i in range(len(sample_results_list)):
-                for j in range(i + 1, len(sample_results_list)):
-                    result_a = sample_results_list[i]
-                    result_b = sample_results_list[j]
-                    
-                    # Determine winner (lower latency wins)
-                    if result_a.latency_ms < result_b.latency_ms:
-                        self._update_elo_pair(result_a.provider, result_b.provider, 1)
-                    elif result_b.latency_ms < result_a.latency_ms:
-                        self._update_elo_pair(result_a.provider, result_b.provider, 0)
-                    else:
-                        self._update_elo_pair(result_a.provider, result_b.provider, 0.5)
-    
-    def _update_elo_pair(self, provider_a: str, provider_b: str, score: float):
-        """Update ELO ratings for a pair of providers"""
-        
-        # Determine winner/loser for database update
-        if score > 0.5:
-            # Provider A wins
-            db.update_elo_ratings(provider_a, provider_b, BENCHMARK_CONFIG["elo_k_factor"])
-        elif score < 0.5:
-            # Provider B wins
-            db.update_elo_ratings(provider_b, provider_a, BENCHMARK_CONFIG["elo_k_factor"])
-        # For ties (score == 0.5), we don't update ELO ratings
+
+            latencies = group["latency_ms"].to_numpy()
+            providers = group["provider"].to_numpy()
+            order = np.argsort(latencies, kind="stable")
+            sorted_latencies = latencies[order]
+            sorted_providers = providers[order]
+
+            # Lower latency wins; ties and same-provider pairs don't
+            # update ratings, as before
+            for i in range(len(order)):
+                for j in range(i + 1, len(order)):
+                    if (sorted_providers[i] != sorted_providers[j]
+                            and sorted_latencies[i] < sorted_latencies[j]):
+                        outcomes.append((sorted_providers[i], sorted_providers[j]))
+
+        db.bulk_update_elo(outcomes, BENCHMARK_CONFIG["elo_k_factor"])
     
     def get_leaderboard(self, language: str = "all") -> List[Dict[str, Any]]:
         """Get current ELO leaderboard from database for a specific language"""
@@ -396,26 +632,64 @@ class BenchmarkEngine:
         
         return leaderboard
     
-    def export_results(self, filename: str, format: str = "json"):
-        """Export benchmark results"""
-        
+    def _result_record(self, result: BenchmarkResult, include_audio: bool = False) -> Dict[str, Any]:
+        """Flatten a result to a plain dict, dropping the heavyweight fields
+
+        Skips the recursive deep copy of dataclasses.asdict and leaves out
+        audio_data (raw bytes) and the nested sample unless asked for.
+        """
+        skip = {"sample"} if include_audio else {"sample", "audio_data"}
+        return {
+            field.name: getattr(result, field.name)
+            for field in fields(BenchmarkResult) if field.name not in skip
+        }
+
+    def export_results(self, filename: str, format: str = "json", include_audio: bool = False):
+        """Export benchmark results
+
+        Rows are streamed to disk one result at a time so exports run in
+        constant memory instead of materializing a second copy of the list.
+        """
         if format.lower() == "json":
-            data = [asdict(result) for result in self.results]
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2)
-        
+            if orjson is not None:
+                # orjson serializes each record in C; falls back to the
+                # stdlib below when the package isn't installed
+                with open(filename, 'wb') as f:
+                    f.write(b'[\n')
+                    for i, result in enumerate(self.results):
+                        if i:
+                            f.write(b',\n')
+                        f.write(orjson.dumps(self._result_record(result, include_audio)))
+                    f.write(b'\n]')
+            else:
+                with open(filename, 'w') as f:
+                    f.write('[\n')
+                    for i, result in enumerate(self.results):
+                        if i:
+                            f.write(',\n')
+                        json.dump(self._result_record(result, include_audio), f)
+                    f.write('\n]')
+
         elif format.lower() == "csv":
-            df = pd.DataFrame([asdict(result) for result in self.results])
-            df.to_csv(filename, index=False)
-        
+            fieldnames = [
+                field.name for field in fields(BenchmarkResult)
+                if field.name != "sample" and (include_audio or field.name != "audio_data")
+            ]
+            with open(filename, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                for result in self.results:
+                    writer.writerow(self._result_record(result, include_audio))
+
         else:
             raise ValueError(f"Unsupported export format: {format}")
     
     def load_results(self, filename: str):
         """Load benchmark results from file"""
-        
-        with open(filename, 'r') as f:
-            data = json.load(f)
+
+        with open(filename, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         
         self.results = []
         for item in data:
@@ -424,4 +698,29 @@ class BenchmarkEngine:
     
     def get_results_dataframe(self) -> pd.DataFrame:
         """Get results as pandas DataFrame for analysis"""
-        return pd.DataFrame([asdict(result) for result in self.results])
+        # Column-wise construction skips asdict's recursive deep copy and
+        # leaves the audio bytes and nested sample out of the frame entirely
+        df = pd.DataFrame({
+            field.name: [getattr(result, field.name) for result in self.results]
+            for field in fields(BenchmarkResult)
+            if field.name not in ("audio_data", "sample")
+        }, copy=False)
+
+        if df.empty:
+            return df
+
+        # Intern low-cardinality string fields as category dtype and downcast
+        # wide numerics - roughly halves memory for large result sets and
+        # speeds up downstream groupby/serialization
+        df = df.astype({
+            "provider": "category",
+            "voice": "category",
+            "sample_id": "category",
+            "latency_ms": "float32",
+            "latency_1": "float32",
+            "ttfb": "float32",
+            "file_size_bytes": "uint32",
+            "iteration": "uint16"
+        })
+
+        return df
@@ -2,6 +2,7 @@
 Configuration settings for the TTS Benchmarking Tool
 """
 import os
+from functools import lru_cache
 from typing import Dict, List, Any
 from dataclasses import dataclass
 
@@ -66,7 +67,8 @@ BENCHMARK_CONFIG = {
     "quality_metrics": ["duration", "file_size", "sample_rate"],
     "latency_percentiles": [50, 90, 95, 99],
     "elo_k_factor": 32,
-    "initial_elo_rating": 1500
+    "initial_elo_rating": 1500,
+    "max_concurrent_requests": 8  # Per-provider in-flight request cap
 }
 
 # Test Dataset Configuration  
@@ -91,8 +93,13 @@ UI_CONFIG = {
     "max_file_size_mb": 10
 }
 
+@lru_cache(maxsize=None)
 def get_api_key(provider: str) -> str:
-    """Get API key for a provider from environment variables"""
+    """Get API key for a provider from environment variables
+
+    Memoized - keys come from the environment loaded at startup and don't
+    change mid-process, but this gets called on every config validation.
+    """
     if provider not in TTS_PROVIDERS:
         raise ValueError(f"Unknown provider: {provider}")
     
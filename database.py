@@ -2,17 +2,56 @@
 Database management for TTS Benchmarking Tool
 Handles persistent storage of results, ELO ratings, and historical data
 """
+import atexit
+import csv
+import hashlib
+import math
+import queue
 import sqlite3
 import json
 import os
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from dataclasses import asdict
 import pandas as pd
 
+# Hot-path SQL hoisted to module level so repeated saves hand SQLite the
+# same string and its per-connection statement cache hits instead of
+# re-preparing on every call
+_INSERT_BENCHMARK_SQL = '''
+    INSERT INTO benchmark_results
+    (test_id, provider, voice, text_id, success, latency_ms, file_size_bytes,
+     error_message, metadata, timestamp, category, word_count,
+     location_country, location_city, location_region, latency_1, ttfb)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_INSERT_VOTE_SQL = '''
+    INSERT INTO user_votes
+    (winner, loser, vote_type, text_sample, session_id, language, timestamp, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, ?)
+'''
+
+_INIT_ELO_SQL = '''
+    INSERT OR IGNORE INTO elo_ratings
+    (provider, language, rating, games_played, wins, losses, last_updated)
+    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+'''
+
 class BenchmarkDatabase:
     """Database manager for benchmark results and ELO ratings"""
-    
+
+    # Shared by the single-vote and bulk ELO paths so SQLite's per-connection
+    # statement cache hits on the same SQL string
+    _ELO_UPDATE_SQL = '''
+        UPDATE elo_ratings
+        SET rating = ?, games_played = games_played + ?, wins = wins + ?,
+            losses = losses + ?, last_updated = CURRENT_TIMESTAMP
+        WHERE provider = ? AND language = ?
+    '''
+
+
     def __init__(self, db_path: str = None):
         # Use environment variable if set, otherwise use default
         if db_path is None:
@@ -24,252 +63,556 @@ class BenchmarkDatabase:
         # See STREAMLIT_CLOUD_DEPLOYMENT.md for setup instructions
         
         self.db_path = db_path
+        # One connection shared across threads (Streamlit runs a thread per
+        # session); writers serialize on the lock so transactions don't
+        # interleave, and the page cache stays hot between calls
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
         self.init_database()
-    
+        # Single-result saves hand off to a background writer thread, so the
+        # benchmarking workers never block on a commit; the writer drains the
+        # queue in batches of up to _max_batch rows per transaction
+        self._max_batch = 200
+        self._queue: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the shared connection, opening it on first use
+
+        WAL journaling with synchronous=NORMAL drops the full fsync per
+        commit that the rollback-journal default pays; the remaining
+        PRAGMAs keep temp structures and a generous page cache in memory.
+        SQLite's page cache is per-connection, so reusing one keeps reads
+        warm instead of starting cold on every method call.
+        """
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                # Name-based row access keeps the read paths stable as
+                # columns are added
+                conn.row_factory = sqlite3.Row
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                conn.execute('PRAGMA temp_store=MEMORY')
+                conn.execute('PRAGMA cache_size=-64000')
+                conn.execute('PRAGMA mmap_size=268435456')
+                self._conn = conn
+            return self._conn
+
+    def close(self):
+        """Flush pending work and close the shared connection"""
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                # Lightweight ANALYZE on whatever tables need it, as the
+                # SQLite docs recommend before closing long-lived connections
+                self._conn.execute('PRAGMA optimize')
+                self._conn.close()
+                self._conn = None
+
+    # Bump together with any new migration below; databases already at this
+    # version skip the whole init body on startup
+    _SCHEMA_VERSION = 1
+
     def init_database(self):
-        """Initialize database tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create benchmark results table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS benchmark_results (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                test_id TEXT,
-                provider TEXT,
-                voice TEXT,
-                text TEXT,
-                success BOOLEAN,
-                latency_ms REAL,
-                file_size_bytes INTEGER,
-                error_message TEXT,
-                metadata TEXT,
-                timestamp DATETIME,
-                category TEXT,
-                word_count INTEGER,
-                location_country TEXT,
-                location_city TEXT,
-                location_region TEXT
-            )
-        ''')
-        
-        # Add geolocation columns if they don't exist (for existing databases)
-        try:
-            cursor.execute('ALTER TABLE benchmark_results ADD COLUMN location_country TEXT')
-        except:
-            pass
-        try:
-            cursor.execute('ALTER TABLE benchmark_results ADD COLUMN location_city TEXT')
-        except:
-            pass
-        try:
-            cursor.execute('ALTER TABLE benchmark_results ADD COLUMN location_region TEXT')
-        except:
-            pass
-        
-        # Add latency_1 column for network latency (pure network RTT without TTS processing)
-        try:
-            cursor.execute('ALTER TABLE benchmark_results ADD COLUMN latency_1 REAL DEFAULT 0')
-        except:
-            pass
-        
-        # Add ttfb column for Time to First Byte
-        try:
-            cursor.execute('ALTER TABLE benchmark_results ADD COLUMN ttfb REAL DEFAULT 0')
-        except:
-            pass
-        
-        # Create ELO ratings table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS elo_ratings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                provider TEXT,
-                language TEXT DEFAULT 'all',
-                rating REAL DEFAULT 1500,
-                games_played INTEGER DEFAULT 0,
-                wins INTEGER DEFAULT 0,
-                losses INTEGER DEFAULT 0,
-                last_updated DATETIME,
-                UNIQUE(provider, language)
-            )
-        ''')
-        
-        # Add language column to existing elo_ratings table if it doesn't exist
-        try:
-            cursor.execute('ALTER TABLE elo_ratings ADD COLUMN language TEXT DEFAULT "all"')
-            # Migrate existing data to have language='all'
-            cursor.execute('UPDATE elo_ratings SET language = "all" WHERE language IS NULL')
-        except:
-            pass
+        """Initialize database tables
+
+        Guarded by PRAGMA user_version: once a database has been brought up
+        to _SCHEMA_VERSION, re-running this costs a single PRAGMA read
+        instead of a pile of CREATE IF NOT EXISTS / ALTER round-trips.
+        """
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            if cursor.execute('PRAGMA user_version').fetchone()[0] >= self._SCHEMA_VERSION:
+                return
+
+            # Create benchmark results table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS benchmark_results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    test_id TEXT,
+                    provider TEXT,
+                    voice TEXT,
+                    text TEXT,
+                    success BOOLEAN,
+                    latency_ms REAL,
+                    file_size_bytes INTEGER,
+                    error_message TEXT,
+                    metadata TEXT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    category TEXT,
+                    word_count INTEGER,
+                    location_country TEXT,
+                    location_city TEXT,
+                    location_region TEXT
+                )
+            ''')
         
-        # Create provider statistics table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS provider_stats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                provider TEXT,
-                total_tests INTEGER DEFAULT 0,
-                successful_tests INTEGER DEFAULT 0,
-                avg_latency REAL DEFAULT 0,
-                avg_file_size REAL DEFAULT 0,
-                last_updated DATETIME
-            )
-        ''')
+            # Add geolocation columns if they don't exist (for existing databases)
+            try:
+                cursor.execute('ALTER TABLE benchmark_results ADD COLUMN location_country TEXT')
+            except:
+                pass
+            try:
+                cursor.execute('ALTER TABLE benchmark_results ADD COLUMN location_city TEXT')
+            except:
+                pass
+            try:
+                cursor.execute('ALTER TABLE benchmark_results ADD COLUMN location_region TEXT')
+            except:
+                pass
+        
+            # Add latency_1 column for network latency (pure network RTT without TTS processing)
+            try:
+                cursor.execute('ALTER TABLE benchmark_results ADD COLUMN latency_1 REAL DEFAULT 0')
+            except:
+                pass
+        
+            # Add ttfb column for Time to First Byte
+            try:
+                cursor.execute('ALTER TABLE benchmark_results ADD COLUMN ttfb REAL DEFAULT 0')
+            except:
+                pass
+        
+            # Add language column to a pre-language elo_ratings table before
+            # any migration that enumerates its columns
+            try:
+                cursor.execute('ALTER TABLE elo_ratings ADD COLUMN language TEXT DEFAULT "all"')
+                # Migrate existing data to have language='all'
+                cursor.execute('UPDATE elo_ratings SET language = "all" WHERE language IS NULL')
+            except:
+                pass
+
+            # Running sum of squared latencies lets the dashboard report a
+            # stddev without rescanning the raw results
+            try:
+                cursor.execute('ALTER TABLE provider_stats ADD COLUMN latency_sq_sum REAL DEFAULT 0')
+            except:
+                pass
+
+            # The lookup tables key directly on provider - a surrogate rowid
+            # plus a UNIQUE index means two B-trees per row, so store them
+            # WITHOUT ROWID with the natural primary key instead (migrating
+            # older databases in place)
+            self._ensure_without_rowid(cursor, 'elo_ratings', '''
+                CREATE TABLE elo_ratings (
+                    provider TEXT,
+                    language TEXT DEFAULT 'all',
+                    rating REAL DEFAULT 1500,
+                    games_played INTEGER DEFAULT 0,
+                    wins INTEGER DEFAULT 0,
+                    losses INTEGER DEFAULT 0,
+                    last_updated DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (provider, language)
+                ) WITHOUT ROWID
+            ''', 'provider, language, rating, games_played, wins, losses, last_updated')
+
+            self._ensure_without_rowid(cursor, 'provider_stats', '''
+                CREATE TABLE provider_stats (
+                    provider TEXT PRIMARY KEY,
+                    total_tests INTEGER DEFAULT 0,
+                    successful_tests INTEGER DEFAULT 0,
+                    avg_latency REAL DEFAULT 0,
+                    avg_file_size REAL DEFAULT 0,
+                    latency_sq_sum REAL DEFAULT 0,
+                    last_updated DATETIME DEFAULT CURRENT_TIMESTAMP
+                ) WITHOUT ROWID
+            ''', 'provider, total_tests, successful_tests, avg_latency, avg_file_size, latency_sq_sum, last_updated')
+
+            # Create test sessions table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS test_sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT,
+                    test_type TEXT,
+                    providers TEXT,
+                    total_tests INTEGER,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    metadata TEXT
+                )
+            ''')
         
-        # Create test sessions table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS test_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id TEXT,
-                test_type TEXT,
-                providers TEXT,
-                total_tests INTEGER,
-                timestamp DATETIME,
-                metadata TEXT
-            )
-        ''')
+            # Create user votes table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS user_votes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    winner TEXT,
+                    loser TEXT,
+                    vote_type TEXT,
+                    text_sample TEXT,
+                    session_id TEXT,
+                    language TEXT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    metadata TEXT
+                )
+            ''')
         
-        # Create user votes table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_votes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                winner TEXT,
-                loser TEXT,
-                vote_type TEXT,
-                text_sample TEXT,
-                session_id TEXT,
-                language TEXT,
-                timestamp DATETIME,
-                metadata TEXT
+            # Add language column to existing user_votes table if it doesn't exist
+            try:
+                cursor.execute('ALTER TABLE user_votes ADD COLUMN language TEXT')
+            except:
+                pass
+
+            # Per-provider vote counters maintained inline by save_user_vote,
+            # so the statistics read path is O(#providers) instead of a
+            # GROUP BY scan over the whole vote history
+            self._ensure_without_rowid(cursor, 'vote_counters', '''
+                CREATE TABLE vote_counters (
+                    provider TEXT,
+                    language TEXT DEFAULT 'all',
+                    wins INTEGER DEFAULT 0,
+                    losses INTEGER DEFAULT 0,
+                    PRIMARY KEY (provider, language)
+                ) WITHOUT ROWID
+            ''', 'provider, language, wins, losses')
+
+            # One-shot backfill from the vote history for existing databases
+            cursor.execute('SELECT COUNT(*) FROM vote_counters')
+            if cursor.fetchone()[0] == 0:
+                cursor.execute('''
+                    INSERT INTO vote_counters (provider, language, wins, losses)
+                    SELECT provider, language, SUM(win), SUM(loss) FROM (
+                        SELECT winner AS provider, COALESCE(language, 'all') AS language,
+                               1 AS win, 0 AS loss
+                        FROM user_votes
+                        UNION ALL
+                        SELECT loser, COALESCE(language, 'all'), 0, 1 FROM user_votes
+                    )
+                    GROUP BY provider, language
+                ''')
+
+            # Sample texts repeat across thousands of rows, so they live
+            # deduplicated in their own table; benchmark rows carry an
+            # integer text_id and scans no longer drag the text bytes along
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS texts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sha1 TEXT UNIQUE,
+                    text TEXT
+                )
+            ''')
+            try:
+                cursor.execute('ALTER TABLE benchmark_results ADD COLUMN text_id INTEGER')
+            except:
+                pass
+
+            # Read paths that want the text go through this view; COALESCE
+            # keeps rows from before the normalization readable
+            cursor.execute('''
+                CREATE VIEW IF NOT EXISTS benchmark_results_full AS
+                SELECT br.id, br.test_id, br.provider, br.voice,
+                       COALESCE(t.text, br.text) AS text,
+                       br.success, br.latency_ms, br.file_size_bytes,
+                       br.error_message, br.metadata, br.timestamp,
+                       br.category, br.word_count, br.location_country,
+                       br.location_city, br.location_region,
+                       br.latency_1, br.ttfb
+                FROM benchmark_results br
+                LEFT JOIN texts t ON br.text_id = t.id
+            ''')
+
+            # One-shot backfill for databases created before the texts table
+            cursor.execute('''
+                SELECT DISTINCT text FROM benchmark_results
+                WHERE text_id IS NULL AND text != ''
+            ''')
+            for (text,) in cursor.fetchall():
+                text_id = self._intern_text(cursor, text)
+                cursor.execute('''
+                    UPDATE benchmark_results SET text_id = ?, text = NULL
+                    WHERE text = ?
+                ''', (text_id, text))
+
+            # Indexes covering the hot query predicates - provider/timestamp
+            # scans and the vote aggregations otherwise walk the whole table
+            # once history grows past a few thousand rows
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_br_provider_ts
+                ON benchmark_results(provider, timestamp DESC)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_br_ts
+                ON benchmark_results(timestamp DESC)
+            ''')
+            # Partial index: the latency stats only ever touch successful rows
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_br_success_provider
+                ON benchmark_results(success, provider, latency_ms)
+                WHERE success = 1
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_votes_winner ON user_votes(winner)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_votes_loser ON user_votes(loser)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_votes_ts ON user_votes(timestamp DESC)')
+
+            # Refresh planner statistics so the new indexes actually get picked
+            cursor.execute('ANALYZE')
+
+            cursor.execute(f'PRAGMA user_version = {self._SCHEMA_VERSION}')
+            conn.commit()
+
+    @staticmethod
+    def _ensure_without_rowid(cursor, table: str, create_sql: str, columns: str):
+        """Create a lookup table as WITHOUT ROWID, migrating a legacy copy
+
+        Older databases created these tables with an AUTOINCREMENT id plus a
+        UNIQUE constraint on the natural key; this rebuilds them around the
+        natural primary key and copies the rows over one time. The id column
+        was never read by any query.
+        """
+        row = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table,)
+        ).fetchone()
+        if row is None:
+            cursor.execute(create_sql)
+        elif 'WITHOUT ROWID' not in row[0]:
+            cursor.execute(f'ALTER TABLE {table} RENAME TO {table}_legacy')
+            cursor.execute(create_sql)
+            cursor.execute(
+                f'INSERT OR IGNORE INTO {table} ({columns}) '
+                f'SELECT {columns} FROM {table}_legacy'
             )
-        ''')
-        
-        # Add language column to existing user_votes table if it doesn't exist
-        try:
-            cursor.execute('ALTER TABLE user_votes ADD COLUMN language TEXT')
-        except:
-            pass
-        
-        conn.commit()
-        conn.close()
-    
+            cursor.execute(f'DROP TABLE {table}_legacy')
+
     def save_benchmark_result(self, result, test_id: str = None):
-        """Save a benchmark result to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO benchmark_results 
-            (test_id, provider, voice, text, success, latency_ms, file_size_bytes, 
-             error_message, metadata, timestamp, category, word_count, 
-             location_country, location_city, location_region, latency_1, ttfb)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            test_id or f"test_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        """Queue a benchmark result for the background writer
+
+        The caller only pays for a queue.put; the writer thread batches
+        queued rows into shared transactions, so request latency is fully
+        decoupled from disk latency.
+        """
+        self._queue.put((result, test_id))
+
+    def _writer_loop(self):
+        """Drain queued results into batched transactions, forever
+
+        Blocks on the first item, then greedily collects whatever else is
+        already queued (up to _max_batch) so bursts share one commit. A
+        failed insert is warned about and then dropped after marking its
+        batch done - the writer must outlive any single bad row.
+        """
+        while True:
+            pending = [self._queue.get()]
+            while len(pending) < self._max_batch:
+                try:
+                    pending.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._insert_results(pending)
+            except Exception as e:
+                print(f"Warning: Failed to save result to database: {e}")
+            finally:
+                for _ in pending:
+                    self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued benchmark result has been written"""
+        self._queue.join()
+
+    def save_benchmark_results(self, results: List) -> None:
+        """Save many benchmark results in a single transaction
+
+        One executemany covers the whole batch instead of a round-trip per
+        test.
+        """
+        if not results:
+            return
+        self._insert_results([(result, None) for result in results])
+
+    @staticmethod
+    def _intern_text(cursor, text: str) -> Optional[int]:
+        """Return the texts-table id for a sample text, inserting if new"""
+        if not text:
+            return None
+        sha1 = hashlib.sha1(text.encode()).hexdigest()
+        cursor.execute('INSERT OR IGNORE INTO texts (sha1, text) VALUES (?, ?)', (sha1, text))
+        cursor.execute('SELECT id FROM texts WHERE sha1 = ?', (sha1,))
+        return cursor.fetchone()[0]
+
+    def _result_row(self, result, now, test_id: str, text_id: Optional[int]) -> tuple:
+        """Build the INSERT parameter tuple for one result"""
+        sample = getattr(result, 'sample', None)
+        return (
+            test_id or f"test_{now.strftime('%Y%m%d_%H%M%S')}",
             result.provider,
             result.voice,
-            result.sample.text if hasattr(result, 'sample') else "",
+            text_id,
             result.success,
             result.latency_ms,
             result.file_size_bytes,
             result.error_message,
             json.dumps(result.metadata) if result.metadata else "{}",
-            datetime.now(),
-            getattr(result.sample, 'category', 'unknown') if hasattr(result, 'sample') else 'unknown',
-            getattr(result.sample, 'word_count', 0) if hasattr(result, 'sample') else 0,
+            getattr(result, 'timestamp', None) or now,
+            getattr(sample, 'category', 'unknown') if sample else 'unknown',
+            getattr(sample, 'word_count', 0) if sample else 0,
             getattr(result, 'location_country', 'Unknown'),
             getattr(result, 'location_city', 'Unknown'),
             getattr(result, 'location_region', 'Unknown'),
             getattr(result, 'latency_1', 0.0),
             getattr(result, 'ttfb', 0.0)
-        ))
-        
-        conn.commit()
-        conn.close()
-        
-        # Update provider statistics
-        self.update_provider_stats(result.provider, result)
-    
-    def update_provider_stats(self, provider: str, result):
-        """Update provider statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get current stats
-        cursor.execute('SELECT * FROM provider_stats WHERE provider = ?', (provider,))
-        stats = cursor.fetchone()
-        
-        if stats:
-            # Update existing stats
-            total_tests = stats[2] + 1
-            successful_tests = stats[3] + (1 if result.success else 0)
-            
-            # Calculate new averages
-            if result.success:
-                old_avg_latency = stats[4]
-                old_avg_file_size = stats[5]
-                
-                new_avg_latency = ((old_avg_latency * successful_tests) + result.latency_ms) / (successful_tests + 1) if successful_tests > 0 else result.latency_ms
-                new_avg_file_size = ((old_avg_file_size * successful_tests) + result.file_size_bytes) / (successful_tests + 1) if successful_tests > 0 else result.file_size_bytes
-            else:
-                new_avg_latency = stats[4]
-                new_avg_file_size = stats[5]
-            
-            cursor.execute('''
-                UPDATE provider_stats 
-                SET total_tests = ?, successful_tests = ?, avg_latency = ?, 
-                    avg_file_size = ?, last_updated = ?
-                WHERE provider = ?
-            ''', (total_tests, successful_tests, new_avg_latency, new_avg_file_size, datetime.now(), provider))
-        else:
-            # Create new stats entry
+        )
+
+    def _insert_results(self, pending: List[tuple]) -> None:
+        """Insert (result, test_id) pairs in one transaction"""
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            now = datetime.now()
+
+            # Intern each distinct sample text once per batch
+            text_ids: Dict[str, Optional[int]] = {}
+            rows = []
+            for result, test_id in pending:
+                sample = getattr(result, 'sample', None)
+                text = sample.text if sample else ""
+                if text not in text_ids:
+                    text_ids[text] = self._intern_text(cursor, text)
+                rows.append(self._result_row(result, now, test_id, text_ids[text]))
+
+            cursor.executemany(_INSERT_BENCHMARK_SQL, rows)
+
+            # Fold provider statistics into the same transaction before the
+            # commit, so one fsync covers the batch and its counters
+            for result, _ in pending:
+                self.update_provider_stats(result.provider, result, cursor)
+
+            conn.commit()
+
+    def update_provider_stats(self, provider: str, result, cursor=None):
+        """Update provider statistics with a single upsert
+
+        The running averages fold the new measurement in directly in SQL
+        (unqualified columns in DO UPDATE refer to the pre-update row), so
+        there is no read-modify-write round-trip. When a cursor is passed
+        the statement joins that cursor's open transaction.
+        """
+        with self._lock:
+            own_conn = None
+            if cursor is None:
+                own_conn = self._connect()
+                cursor = own_conn.cursor()
+
+            success = 1 if result.success else 0
             cursor.execute('''
-                INSERT INTO provider_stats 
-                (provider, total_tests, successful_tests, avg_latency, avg_file_size, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO provider_stats
+                (provider, total_tests, successful_tests, avg_latency, avg_file_size, latency_sq_sum, last_updated)
+                VALUES (?, 1, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(provider) DO UPDATE SET
+                    total_tests = total_tests + 1,
+                    successful_tests = successful_tests + excluded.successful_tests,
+                    avg_latency = CASE WHEN excluded.successful_tests = 1
+                        THEN (avg_latency * successful_tests + excluded.avg_latency)
+                             / (successful_tests + 1)
+                        ELSE avg_latency END,
+                    avg_file_size = CASE WHEN excluded.successful_tests = 1
+                        THEN (avg_file_size * successful_tests + excluded.avg_file_size)
+                             / (successful_tests + 1)
+                        ELSE avg_file_size END,
+                    latency_sq_sum = latency_sq_sum + excluded.latency_sq_sum,
+                    last_updated = excluded.last_updated
             ''', (
-                provider, 1, 1 if result.success else 0,
+                provider, success,
                 result.latency_ms if result.success else 0,
                 result.file_size_bytes if result.success else 0,
-                datetime.now()
+                result.latency_ms ** 2 if result.success else 0
             ))
-        
-        conn.commit()
-        conn.close()
+
+            if own_conn is not None:
+                own_conn.commit()
     
+    def bulk_update_elo(self, outcomes: List[tuple], k_factor: int = 32, language: str = "all"):
+        """Apply a sequence of (winner, loser) outcomes in one transaction
+
+        Ratings are read once, every pairwise update is applied in memory in
+        order, and the final ratings plus win/loss/game counters are written
+        back with a single executemany instead of two UPDATEs per pair.
+        """
+        if not outcomes:
+            return
+
+        providers = {provider for pair in outcomes for provider in pair}
+
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            # Initialize unknown providers inside the bulk transaction
+            cursor.executemany(_INIT_ELO_SQL, [
+                (provider, language, 1500.0, 0, 0, 0) for provider in providers
+            ])
+
+            placeholders = ','.join('?' * len(providers))
+            cursor.execute(f'''
+                SELECT provider, rating FROM elo_ratings
+                WHERE language = ? AND provider IN ({placeholders})
+            ''', (language, *providers))
+            ratings = dict(cursor.fetchall())
+
+            win_counts = {}
+            loss_counts = {}
+            for winner, loser in outcomes:
+                winner_rating = ratings[winner]
+                loser_rating = ratings[loser]
+
+                expected_winner = 1 / (1 + 10**((loser_rating - winner_rating) / 400))
+                expected_loser = 1 / (1 + 10**((winner_rating - loser_rating) / 400))
+
+                ratings[winner] = winner_rating + k_factor * (1 - expected_winner)
+                ratings[loser] = loser_rating + k_factor * (0 - expected_loser)
+                win_counts[winner] = win_counts.get(winner, 0) + 1
+                loss_counts[loser] = loss_counts.get(loser, 0) + 1
+
+            cursor.executemany(self._ELO_UPDATE_SQL, [
+                (
+                    ratings[provider],
+                    win_counts.get(provider, 0) + loss_counts.get(provider, 0),
+                    win_counts.get(provider, 0),
+                    loss_counts.get(provider, 0),
+                    provider,
+                    language
+                )
+                for provider in providers
+            ])
+
+            conn.commit()
+
     def get_elo_rating(self, provider: str, language: str = "all") -> float:
-        """Get ELO rating for a provider for a specific language"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT rating FROM elo_ratings WHERE provider = ? AND language = ?', (provider, language))
-        result = cursor.fetchone()
-        
-        conn.close()
-        
-        if result:
-            return result[0]
-        else:
-            # Initialize new provider with default rating for this language
-            self.init_elo_rating(provider, language=language)
-            return 1500.0
-    
+        """Get ELO rating for a provider for a specific language
+
+        The INSERT OR IGNORE plus SELECT run as one atomic transaction, so
+        an unknown provider is initialized and read in a single round-trip
+        with no window for a concurrent voter to race the initialization.
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(_INIT_ELO_SQL, (provider, language, 1500.0, 0, 0, 0))
+                result = conn.execute(
+                    'SELECT rating FROM elo_ratings WHERE provider = ? AND language = ?',
+                    (provider, language)
+                ).fetchone()
+        return result[0]
+
     def init_elo_rating(self, provider: str, rating: float = 1500.0, language: str = "all"):
         """Initialize ELO rating for a new provider for a specific language"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR IGNORE INTO elo_ratings 
-            (provider, language, rating, games_played, wins, losses, last_updated)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (provider, language, rating, 0, 0, 0, datetime.now()))
-        
-        conn.commit()
-        conn.close()
+        with self._lock:
+            conn = self._connect()
+            # The with-block commits (or rolls back) the implicit transaction
+            with conn:
+                conn.execute(_INIT_ELO_SQL, (provider, language, rating, 0, 0, 0))
     
     def update_elo_ratings(self, winner: str, loser: str, k_factor: int = 32, language: str = "all", increment_games: bool = True):
         """Update ELO ratings after a comparison for a specific language
-        
+
+        Both ratings are read and both rows written inside one locked
+        transaction, so winner and loser always see the same snapshot and
+        a vote costs one statement-prepare cycle instead of three
+        connections.
+
         Args:
             winner: Winning provider
             loser: Losing provider
@@ -277,239 +620,204 @@ class BenchmarkDatabase:
             language: Language filter (default "all")
             increment_games: Whether to increment games_played counter (default True)
         """
-        winner_rating = self.get_elo_rating(winner, language)
-        loser_rating = self.get_elo_rating(loser, language)
-        
-        # Calculate expected scores
-        expected_winner = 1 / (1 + 10**((loser_rating - winner_rating) / 400))
-        expected_loser = 1 / (1 + 10**((winner_rating - loser_rating) / 400))
-        
-        # Update ratings
-        new_winner_rating = winner_rating + k_factor * (1 - expected_winner)
-        new_loser_rating = loser_rating + k_factor * (0 - expected_loser)
-        
-        # Save updated ratings
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if increment_games:
-            # Update winner with game counter
-            cursor.execute('''
-                UPDATE elo_ratings 
-                SET rating = ?, games_played = games_played + 1, wins = wins + 1, last_updated = ?
-                WHERE provider = ? AND language = ?
-            ''', (new_winner_rating, datetime.now(), winner, language))
-            
-            # Update loser with game counter
-            cursor.execute('''
-                UPDATE elo_ratings 
-                SET rating = ?, games_played = games_played + 1, losses = losses + 1, last_updated = ?
-                WHERE provider = ? AND language = ?
-            ''', (new_loser_rating, datetime.now(), loser, language))
-        else:
-            # Update ratings only (for multi-provider comparisons where we count games separately)
-            cursor.execute('''
-                UPDATE elo_ratings 
-                SET rating = ?, last_updated = ?
-                WHERE provider = ? AND language = ?
-            ''', (new_winner_rating, datetime.now(), winner, language))
-            
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            # Initialize unknown providers inside the same transaction as
+            # the read and the update
+            cursor.executemany(_INIT_ELO_SQL, [
+                (winner, language, 1500.0, 0, 0, 0),
+                (loser, language, 1500.0, 0, 0, 0)
+            ])
+
             cursor.execute('''
-                UPDATE elo_ratings 
-                SET rating = ?, last_updated = ?
-                WHERE provider = ? AND language = ?
-            ''', (new_loser_rating, datetime.now(), loser, language))
-        
-        conn.commit()
-        conn.close()
-        
+                SELECT provider, rating FROM elo_ratings
+                WHERE language = ? AND provider IN (?, ?)
+            ''', (language, winner, loser))
+            ratings = dict(cursor.fetchall())
+            winner_rating = ratings[winner]
+            loser_rating = ratings[loser]
+
+            # Calculate expected scores
+            expected_winner = 1 / (1 + 10**((loser_rating - winner_rating) / 400))
+            expected_loser = 1 / (1 + 10**((winner_rating - loser_rating) / 400))
+
+            # Update ratings
+            new_winner_rating = winner_rating + k_factor * (1 - expected_winner)
+            new_loser_rating = loser_rating + k_factor * (0 - expected_loser)
+
+            # For multi-provider comparisons games are counted separately
+            games = 1 if increment_games else 0
+            cursor.executemany(self._ELO_UPDATE_SQL, [
+                (new_winner_rating, games, games, 0, winner, language),
+                (new_loser_rating, games, 0, games, loser, language)
+            ])
+
+            conn.commit()
         return new_winner_rating, new_loser_rating
     
     def increment_provider_games(self, provider: str, won: bool, language: str = "all"):
         """Increment games_played counter for a provider (used for multi-provider tests)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if won:
-            cursor.execute('''
-                UPDATE elo_ratings 
-                SET games_played = games_played + 1, wins = wins + 1, last_updated = ?
-                WHERE provider = ? AND language = ?
-            ''', (datetime.now(), provider, language))
-        else:
-            cursor.execute('''
-                UPDATE elo_ratings 
-                SET games_played = games_played + 1, losses = losses + 1, last_updated = ?
-                WHERE provider = ? AND language = ?
-            ''', (datetime.now(), provider, language))
-        
-        conn.commit()
-        conn.close()
+        counter = 'wins' if won else 'losses'
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(f'''
+                    UPDATE elo_ratings
+                    SET games_played = games_played + 1, {counter} = {counter} + 1, last_updated = CURRENT_TIMESTAMP
+                    WHERE provider = ? AND language = ?
+                ''', (provider, language))
     
     def get_all_elo_ratings(self, language: str = "all") -> Dict[str, Dict]:
         """Get all ELO ratings for a specific language, or aggregate across all languages if language='all'"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        conn = self._connect()
+
         if language == "all":
             # Aggregate across all languages - sum games_played, wins, losses, and calculate weighted average rating
-            cursor.execute('''
-                SELECT 
+            cursor = conn.execute('''
+                SELECT
                     provider,
-                    AVG(rating) as avg_rating,
-                    SUM(games_played) as total_games_played,
-                    SUM(wins) as total_wins,
-                    SUM(losses) as total_losses,
+                    AVG(rating) as rating,
+                    SUM(games_played) as games_played,
+                    SUM(wins) as wins,
+                    SUM(losses) as losses,
                     MAX(last_updated) as last_updated
-                FROM elo_ratings 
+                FROM elo_ratings
                 GROUP BY provider
-                ORDER BY avg_rating DESC
+                ORDER BY rating DESC
             ''')
         else:
-            # Query specific columns by name for a specific language
-            cursor.execute('''
-                SELECT provider, rating, games_played, wins, losses, last_updated 
-                FROM elo_ratings 
-                WHERE language = ? 
+            cursor = conn.execute('''
+                SELECT provider, rating, games_played, wins, losses, last_updated
+                FROM elo_ratings
+                WHERE language = ?
                 ORDER BY rating DESC
             ''', (language,))
-        
-        results = cursor.fetchall()
-        conn.close()
-        
+
+        def as_float(value, default):
+            try:
+                return float(value) if value is not None else default
+            except (ValueError, TypeError):
+                return default
+
+        # Both branches alias their columns identically, and sqlite3.Row
+        # lets us pick them by name instead of fragile positions
         ratings = {}
-        for row in results:
-            if language == "all":
-                # Column order: provider, avg_rating, total_games_played, total_wins, total_losses, last_updated
-                provider = row[0]
-                try:
-                    rating = float(row[1]) if row[1] is not None else 1500.0
-                except (ValueError, TypeError):
-                    rating = 1500.0
-                    
-                try:
-                    games_played = float(row[2]) if row[2] is not None else 0.0
-                except (ValueError, TypeError):
-                    games_played = 0.0
-                    
-                try:
-                    wins = float(row[3]) if row[3] is not None else 0.0
-                except (ValueError, TypeError):
-                    wins = 0.0
-                    
-                try:
-                    losses = float(row[4]) if row[4] is not None else 0.0
-                except (ValueError, TypeError):
-                    losses = 0.0
-            else:
-                # Column order: provider, rating, games_played, wins, losses, last_updated
-                provider = row[0]
-                try:
-                    rating = float(row[1]) if row[1] is not None else 1500.0
-                except (ValueError, TypeError):
-                    rating = 1500.0
-                    
-                try:
-                    games_played = float(row[2]) if row[2] is not None else 0.0
-                except (ValueError, TypeError):
-                    games_played = 0.0
-                    
-                try:
-                    wins = float(row[3]) if row[3] is not None else 0.0
-                except (ValueError, TypeError):
-                    wins = 0.0
-                    
-                try:
-                    losses = float(row[4]) if row[4] is not None else 0.0
-                except (ValueError, TypeError):
-                    losses = 0.0
-            
-            ratings[provider] = {
-                'rating': rating,
+        for row in cursor.fetchall():
+            games_played = as_float(row['games_played'], 0.0)
+            wins = as_float(row['wins'], 0.0)
+            ratings[row['provider']] = {
+                'rating': as_float(row['rating'], 1500.0),
                 'games_played': games_played,
                 'wins': wins,
-                'losses': losses,
+                'losses': as_float(row['losses'], 0.0),
                 'win_rate': (wins / games_played * 100) if games_played > 0 else 0.0,
-                'last_updated': row[5] if len(row) > 5 else None
+                'last_updated': row['last_updated']
             }
         
         return ratings
     
     def get_available_languages(self) -> List[str]:
         """Get list of languages that have ELO ratings"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT DISTINCT language FROM elo_ratings ORDER BY language')
-        results = cursor.fetchall()
-        
-        conn.close()
+        conn = self._connect()
+
+        results = conn.execute('SELECT DISTINCT language FROM elo_ratings ORDER BY language').fetchall()
         
         languages = [row[0] for row in results if row[0]]
         return languages if languages else ["all"]
     
     def get_provider_stats(self) -> Dict[str, Dict]:
         """Get all provider statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM provider_stats')
-        results = cursor.fetchall()
-        
-        conn.close()
-        
+        conn = self._connect()
+
+        results = conn.execute('SELECT * FROM provider_stats').fetchall()
+
         stats = {}
         for row in results:
-            stats[row[1]] = {
-                'total_tests': row[2],
-                'successful_tests': row[3],
-                'success_rate': (row[3] / row[2] * 100) if row[2] > 0 else 0,
-                'avg_latency': row[4],
-                'avg_file_size': row[5],
-                'last_updated': row[6]
+            successful = row['successful_tests']
+            avg_latency = row['avg_latency']
+            # E[x^2] - E[x]^2, clamped: databases from before the
+            # latency_sq_sum column have no squared history to draw on
+            variance = (row['latency_sq_sum'] / successful - avg_latency ** 2) if successful > 0 else 0
+            stats[row['provider']] = {
+                'total_tests': row['total_tests'],
+                'successful_tests': successful,
+                'success_rate': (successful / row['total_tests'] * 100) if row['total_tests'] > 0 else 0,
+                'avg_latency': avg_latency,
+                'latency_stddev': math.sqrt(variance) if variance > 0 else 0.0,
+                'avg_file_size': row['avg_file_size'],
+                'last_updated': row['last_updated']
             }
-        
+
         return stats
     
+    def _recent_result_rows(self, limit: int = 100):
+        """Get recent results as (column names, cursor) without pandas
+
+        Callers that only need dicts (export) can iterate the cursor
+        directly and skip DataFrame construction entirely.
+        """
+        conn = self._connect()
+        cursor = conn.execute('''
+            SELECT * FROM benchmark_results_full
+            ORDER BY timestamp DESC
+            LIMIT ?
+        ''', (limit,))
+        columns = [description[0] for description in cursor.description]
+        return columns, cursor
+
     def get_recent_results(self, limit: int = 100) -> pd.DataFrame:
         """Get recent benchmark results as DataFrame"""
-        conn = sqlite3.connect(self.db_path)
-        
-        df = pd.read_sql_query('''
-            SELECT * FROM benchmark_results 
-            ORDER BY timestamp DESC 
-            LIMIT ?
-        ''', conn, params=(limit,))
-        
-        conn.close()
-        return df
+        columns, cursor = self._recent_result_rows(limit)
+        return pd.DataFrame(cursor.fetchall(), columns=columns)
     
     def get_results_by_provider(self, provider: str, limit: int = 50) -> pd.DataFrame:
         """Get results for a specific provider"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         
         df = pd.read_sql_query('''
-            SELECT * FROM benchmark_results 
+            SELECT * FROM benchmark_results_full
             WHERE provider = ?
-            ORDER BY timestamp DESC 
+            ORDER BY timestamp DESC
             LIMIT ?
         ''', conn, params=(provider, limit))
         
-        conn.close()
         return df
     
     def clear_old_data(self, days_old: int = 30):
-        """Clear data older than specified days"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            DELETE FROM benchmark_results 
-            WHERE timestamp < datetime('now', '-{} days')
-        '''.format(days_old))
-        
-        conn.commit()
-        conn.close()
+        """Clear data older than specified days
+
+        The delete seeks on the timestamp index instead of scanning, drops
+        sample texts that no longer have any referencing rows, and gives the
+        freed pages back to the filesystem - a bare DELETE leaves them as
+        fragmentation that every later scan still pays for.
+        """
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                DELETE FROM benchmark_results
+                WHERE timestamp < datetime('now', ?)
+            ''', (f'-{days_old} days',))
+            deleted = cursor.rowcount
+
+            cursor.execute('''
+                DELETE FROM texts
+                WHERE id NOT IN (
+                    SELECT text_id FROM benchmark_results WHERE text_id IS NOT NULL
+                )
+            ''')
+
+            conn.commit()
+
+            # VACUUM must run outside the transaction; skip it when nothing
+            # was removed. The delete shifts table cardinalities, so refresh
+            # planner statistics afterwards too
+            if deleted:
+                conn.execute('VACUUM')
+                conn.execute('PRAGMA optimize')
     
     def export_data(self, format: str = 'json') -> str:
         """Export all data to file"""
@@ -517,267 +825,251 @@ class BenchmarkDatabase:
         
         if format.lower() == 'json':
             filename = f"benchmark_export_{timestamp}.json"
-            
-            data = {
-                'elo_ratings': self.get_all_elo_ratings(),
-                'provider_stats': self.get_provider_stats(),
-                'recent_results': self.get_recent_results(1000).to_dict('records'),
-                'export_timestamp': timestamp
-            }
-            
+
+            # Stream recent results straight from the cursor - building a
+            # DataFrame just to call .to_dict('records') on it allocates
+            # 1000 row dicts plus 17 typed columns that are thrown away
             with open(filename, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+                f.write('{\n')
+                f.write('"elo_ratings": ')
+                json.dump(self.get_all_elo_ratings(), f, indent=2, default=str)
+                f.write(',\n"provider_stats": ')
+                json.dump(self.get_provider_stats(), f, indent=2, default=str)
+                f.write(',\n"export_timestamp": ')
+                json.dump(timestamp, f)
+                f.write(',\n"recent_results": [\n')
+
+                columns, cursor = self._recent_result_rows(1000)
+                cursor.arraysize = 1000
+                first = True
+                while True:
+                    batch = cursor.fetchmany()
+                    if not batch:
+                        break
+                    for row in batch:
+                        if not first:
+                            f.write(',\n')
+                        json.dump(dict(zip(columns, row)), f, default=str)
+                        first = False
+                f.write('\n]}\n')
                 
         elif format.lower() == 'csv':
             filename = f"benchmark_export_{timestamp}.csv"
-            df = self.get_recent_results(1000)
-            df.to_csv(filename, index=False)
+            # The cursor is already iterable row by row, so csv.writer can
+            # stream straight to disk without a DataFrame in the middle
+            columns, cursor = self._recent_result_rows(1000)
+            with open(filename, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                writer.writerows(cursor)
         
         return filename
     
     def save_user_vote(self, winner: str, loser: str, text_sample: str, session_id: str = "default", language: str = "all"):
         """Save a user preference vote with language information"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Ensure language is not None or empty
-        if not language or language.strip() == "":
-            language = "all"
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
         
-        cursor.execute('''
-            INSERT INTO user_votes 
-            (winner, loser, vote_type, text_sample, session_id, language, timestamp, metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            winner, loser, 'user_preference', text_sample, session_id, language,
-            datetime.now(), json.dumps({'vote_source': 'quick_test'})
-        ))
-        
-        conn.commit()
-        conn.close()
-    
-    def get_vote_statistics(self, language: str = "all") -> Dict[str, Any]:
-        """Get voting statistics for a specific language"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+            # Ensure language is not None or empty
+            if not language or language.strip() == "":
+                language = "all"
         
-        if language == "all":
-            # Get total votes per provider across ALL languages (include all votes regardless of language value)
+            cursor.execute(_INSERT_VOTE_SQL, (
+                winner, loser, 'user_preference', text_sample, session_id, language,
+                json.dumps({'vote_source': 'quick_test'})
+            ))
+
+            # Keep the pre-aggregated counters in step within the same
+            # transaction
             cursor.execute('''
-                SELECT winner, COUNT(*) as wins FROM user_votes 
-                GROUP BY winner
-            ''')
-            wins = dict(cursor.fetchall())
-            
+                INSERT INTO vote_counters (provider, language, wins, losses)
+                VALUES (?, ?, 1, 0)
+                ON CONFLICT(provider, language) DO UPDATE SET wins = wins + 1
+            ''', (winner, language))
             cursor.execute('''
-                SELECT loser, COUNT(*) as losses FROM user_votes 
-                GROUP BY loser  
-            ''')
-            losses = dict(cursor.fetchall())
-            
-            # Get recent votes
-            cursor.execute('''
-                SELECT winner, loser, timestamp FROM user_votes 
-                ORDER BY timestamp DESC LIMIT 10
-            ''')
+                INSERT INTO vote_counters (provider, language, wins, losses)
+                VALUES (?, ?, 0, 1)
+                ON CONFLICT(provider, language) DO UPDATE SET losses = losses + 1
+            ''', (loser, language))
+
+            conn.commit()
+    
+    def get_vote_win_rates(self, language: str = "all") -> pd.DataFrame:
+        """Get per-provider vote wins, losses and win rate from the counters
+
+        Reads the pre-aggregated vote_counters table maintained by
+        save_user_vote, so the cost is O(#providers) regardless of how many
+        votes have accumulated.
+        """
+        conn = self._connect()
+
+        if language == "all":
+            query = '''
+                SELECT provider,
+                       SUM(wins) AS wins,
+                       SUM(losses) AS losses,
+                       SUM(wins) * 100.0 / (SUM(wins) + SUM(losses)) AS win_rate
+                FROM vote_counters
+                GROUP BY provider
+            '''
+            df = pd.read_sql_query(query, conn)
         else:
-            # Get votes filtered by language (also include NULL as "all" if querying "all")
-            cursor.execute('''
-                SELECT winner, COUNT(*) as wins FROM user_votes 
-                WHERE language = ? GROUP BY winner
-            ''', (language,))
-            wins = dict(cursor.fetchall())
-            
-            cursor.execute('''
-                SELECT loser, COUNT(*) as losses FROM user_votes 
-                WHERE language = ? GROUP BY loser
-            ''', (language,))
-            losses = dict(cursor.fetchall())
-            
-            # Get recent votes for this language
-            cursor.execute('''
-                SELECT winner, loser, timestamp FROM user_votes 
-                WHERE language = ? ORDER BY timestamp DESC LIMIT 10
-            ''', (language,))
-        
-        recent_votes = cursor.fetchall()
-        
-        conn.close()
-        
+            query = '''
+                SELECT provider,
+                       SUM(wins) AS wins,
+                       SUM(losses) AS losses,
+                       SUM(wins) * 100.0 / (SUM(wins) + SUM(losses)) AS win_rate
+                FROM vote_counters
+                WHERE language = ?
+                GROUP BY provider
+            '''
+            df = pd.read_sql_query(query, conn, params=(language,))
+
+        return df
+
+    def get_votes_fingerprint(self) -> tuple:
+        """Get a cheap fingerprint of the user_votes table (row count + latest timestamp)
+
+        Used as a cache key so expensive aggregations can be skipped when
+        no new votes have been recorded.
+        """
+        conn = self._connect()
+
+        row = conn.execute('SELECT COUNT(*), MAX(timestamp) FROM user_votes').fetchone()
+
+
+        return (row[0], row[1])
+
+    def get_vote_totals(self, language: str = "all") -> int:
+        """Get the total number of user votes, optionally filtered by language"""
+        conn = self._connect()
+
+        # Every vote adds exactly one win, so the counters give the total
+        # without touching the vote history
+        if language == "all":
+            cursor = conn.execute('SELECT COALESCE(SUM(wins), 0) FROM vote_counters')
+        else:
+            cursor = conn.execute('SELECT COALESCE(SUM(wins), 0) FROM vote_counters WHERE language = ?', (language,))
+        total = cursor.fetchone()[0]
+
+        return total
+
+    def get_recent_votes(self, language: str = "all", limit: int = 10) -> List[tuple]:
+        """Get the most recent (winner, loser, timestamp) votes, bounded server-side"""
+        conn = self._connect()
+
+        if language == "all":
+            cursor = conn.execute('''
+                SELECT winner, loser, timestamp FROM user_votes
+                ORDER BY timestamp DESC LIMIT ?
+            ''', (limit,))
+        else:
+            cursor = conn.execute('''
+                SELECT winner, loser, timestamp FROM user_votes
+                WHERE language = ? ORDER BY timestamp DESC LIMIT ?
+            ''', (language, limit))
+        recent_votes = [tuple(row) for row in cursor.fetchall()]
+
+        return recent_votes
+
+    def get_vote_statistics(self, language: str = "all", recent_limit: int = 10) -> Dict[str, Any]:
+        """Get voting statistics for a specific language
+
+        Composed from the targeted queries above: one aggregate for
+        wins/losses per provider and one LIMIT-bounded query for recent
+        votes, rather than separate GROUP BY scans per role. Callers that
+        need only a slice of this data should use the targeted methods
+        directly.
+        """
+        rates = self.get_vote_win_rates(language)
+        wins = {
+            provider: int(count)
+            for provider, count in zip(rates['provider'], rates['wins']) if count
+        }
+        losses = {
+            provider: int(count)
+            for provider, count in zip(rates['provider'], rates['losses']) if count
+        }
+
         return {
             'wins': wins,
             'losses': losses,
-            'recent_votes': recent_votes,
+            'recent_votes': self.get_recent_votes(language, recent_limit),
             'total_votes': sum(wins.values())
         }
     
-    def get_latency_stats_by_provider(self) -> Dict[str, Dict]:
-        """Get latency statistics including P95 for each provider"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get all successful results grouped by provider
-        cursor.execute('''
-            SELECT provider, latency_ms 
-            FROM benchmark_results 
-            WHERE success = 1 AND latency_ms > 0
-            ORDER BY provider, latency_ms
+    @staticmethod
+    def _percentile_expr(fraction: float, alias: str) -> str:
+        """SQL aggregate computing one interpolated percentile over ranked rows
+
+        Expects rows tagged with a zero-based rank r and group size n. The
+        target index is fraction*(n-1); the floor row contributes weight
+        (1-frac) and the next row weight frac, reproducing the linear
+        interpolation the old Python percentile() helper used.
+        """
+        lo = f'CAST({fraction} * (n - 1) AS INT)'
+        frac = f'({fraction} * (n - 1) - {lo})'
+        return (f'SUM(CASE WHEN r = {lo} THEN v * (1 - {frac}) '
+                f'WHEN r = {lo} + 1 THEN v * {frac} ELSE 0 END) AS {alias}')
+
+    def _column_stats_by_provider(self, column: str, prefix: str) -> Dict[str, Dict]:
+        """Per-provider avg/percentile/min/max stats for one metric column
+
+        The percentiles are computed inside SQLite with window functions, so
+        only a handful of numbers per provider cross into Python instead of
+        the full measurement history.
+        """
+        conn = self._connect()
+
+        percentiles = ',\n                   '.join(
+            self._percentile_expr(fraction, alias)
+            for fraction, alias in [(0.5, 'p50'), (0.9, 'p90'), (0.95, 'p95'), (0.99, 'p99')]
+        )
+        cursor = conn.execute(f'''
+            WITH ranked AS (
+                SELECT provider, {column} AS v,
+                       ROW_NUMBER() OVER (PARTITION BY provider ORDER BY {column}) - 1 AS r,
+                       COUNT(*) OVER (PARTITION BY provider) AS n
+                FROM benchmark_results
+                WHERE success = 1 AND {column} > 0
+            )
+            SELECT provider, AVG(v), {percentiles},
+                   MIN(v), MAX(v), MAX(n)
+            FROM ranked
+            GROUP BY provider
         ''')
-        results = cursor.fetchall()
-        conn.close()
-        
-        # Group by provider and calculate statistics
-        provider_latencies = {}
-        for provider, latency in results:
-            if provider not in provider_latencies:
-                provider_latencies[provider] = []
-            provider_latencies[provider].append(latency)
-        
-        # Calculate statistics for each provider
+
         stats = {}
-        for provider, latencies in provider_latencies.items():
-            if not latencies:
-                continue
-            
-            latencies_sorted = sorted(latencies)
-            n = len(latencies_sorted)
-            
-            # Calculate percentiles
-            def percentile(data, p):
-                if not data:
-                    return 0
-                index = (p / 100) * (len(data) - 1)
-                if index.is_integer():
-                    return data[int(index)]
-                else:
-                    lower = data[int(index)]
-                    upper = data[int(index) + 1]
-                    return lower + (upper - lower) * (index - int(index))
-            
+        for provider, avg, p50, p90, p95, p99, vmin, vmax, n in cursor.fetchall():
             stats[provider] = {
-                'avg_latency': sum(latencies) / n if n > 0 else 0,
-                'median_latency': percentile(latencies_sorted, 50),
-                'p90_latency': percentile(latencies_sorted, 90),
-                'p95_latency': percentile(latencies_sorted, 95),
-                'p99_latency': percentile(latencies_sorted, 99),
-                'min_latency': latencies_sorted[0] if latencies_sorted else 0,
-                'max_latency': latencies_sorted[-1] if latencies_sorted else 0,
+                f'avg_{prefix}': avg,
+                f'median_{prefix}': p50,
+                f'p90_{prefix}': p90,
+                f'p95_{prefix}': p95,
+                f'p99_{prefix}': p99,
+                f'min_{prefix}': vmin,
+                f'max_{prefix}': vmax,
                 'total_tests': n
             }
-        
+
         return stats
-    
+
+    def get_latency_stats_by_provider(self) -> Dict[str, Dict]:
+        """Get latency statistics including P95 for each provider"""
+        return self._column_stats_by_provider('latency_ms', 'latency')
+
     def get_ping_stats_by_provider(self) -> Dict[str, Dict]:
         """Get network latency (latency_1) statistics for each provider"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get all successful results with ping data grouped by provider
-        cursor.execute('''
-            SELECT provider, latency_1 
-            FROM benchmark_results 
-            WHERE success = 1 AND latency_1 > 0
-            ORDER BY provider, latency_1
-        ''')
-        results = cursor.fetchall()
-        conn.close()
-        
-        # Group by provider and calculate statistics
-        provider_pings = {}
-        for provider, ping in results:
-            if provider not in provider_pings:
-                provider_pings[provider] = []
-            provider_pings[provider].append(ping)
-        
-        # Calculate statistics for each provider
-        stats = {}
-        for provider, pings in provider_pings.items():
-            if not pings:
-                continue
-            
-            pings_sorted = sorted(pings)
-            n = len(pings_sorted)
-            
-            # Calculate percentiles
-            def percentile(data, p):
-                if not data:
-                    return 0
-                index = (p / 100) * (len(data) - 1)
-                if index.is_integer():
-                    return data[int(index)]
-                else:
-                    lower = data[int(index)]
-                    upper = data[int(index) + 1]
-                    return lower + (upper - lower) * (index - int(index))
-            
-            stats[provider] = {
-                'avg_ping': sum(pings) / n if n > 0 else 0,
-                'median_ping': percentile(pings_sorted, 50),
-                'p90_ping': percentile(pings_sorted, 90),
-                'p95_ping': percentile(pings_sorted, 95),
-                'p99_ping': percentile(pings_sorted, 99),
-                'min_ping': pings_sorted[0] if pings_sorted else 0,
-                'max_ping': pings_sorted[-1] if pings_sorted else 0,
-                'total_tests': n
-            }
-        
-        return stats
-    
+        return self._column_stats_by_provider('latency_1', 'ping')
+
     def get_ttfb_stats_by_provider(self) -> Dict[str, Dict]:
         """Get TTFB (Time to First Byte) statistics for each provider"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get all successful results with TTFB data grouped by provider
-        cursor.execute('''
-            SELECT provider, ttfb 
-            FROM benchmark_results 
-            WHERE success = 1 AND ttfb > 0
-            ORDER BY provider, ttfb
-        ''')
-        results = cursor.fetchall()
-        conn.close()
-        
-        # Group by provider and calculate statistics
-        provider_ttfbs = {}
-        for provider, ttfb in results:
-            if provider not in provider_ttfbs:
-                provider_ttfbs[provider] = []
-            provider_ttfbs[provider].append(ttfb)
-        
-        # Calculate statistics for each provider
-        stats = {}
-        for provider, ttfbs in provider_ttfbs.items():
-            if not ttfbs:
-                continue
-            
-            ttfbs_sorted = sorted(ttfbs)
-            n = len(ttfbs_sorted)
-            
-            # Calculate percentiles
-            def percentile(data, p):
-                if not data:
-                    return 0
-                index = (p / 100) * (len(data) - 1)
-                if index.is_integer():
-                    return data[int(index)]
-                else:
-                    lower = data[int(index)]
-                    upper = data[int(index) + 1]
-                    return lower + (upper - lower) * (index - int(index))
-            
-            stats[provider] = {
-                'avg_ttfb': sum(ttfbs) / n if n > 0 else 0,
-                'median_ttfb': percentile(ttfbs_sorted, 50),
-                'p90_ttfb': percentile(ttfbs_sorted, 90),
-                'p95_ttfb': percentile(ttfbs_sorted, 95),
-                'p99_ttfb': percentile(ttfbs_sorted, 99),
-                'min_ttfb': ttfbs_sorted[0] if ttfbs_sorted else 0,
-                'max_ttfb': ttfbs_sorted[-1] if ttfbs_sorted else 0,
-                'total_tests': n
-            }
-        
-        return stats
+        return self._column_stats_by_provider('ttfb', 'ttfb')
 
 # Global database instance
-db = BenchmarkDatabase()
\ No newline at end of file
+db = BenchmarkDatabase()
+
+# Make sure any buffered results land and the shared connection shuts down
+# cleanly even if the process exits before a threshold flush
+atexit.register(db.close)
\ No newline at end of file
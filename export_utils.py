@@ -3,6 +3,7 @@ Export utilities for benchmark results
 """
 import json
 import csv
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from typing import List, Dict, Any, Optional
@@ -10,6 +11,16 @@ import io
 import zipfile
 from dataclasses import asdict
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
 from benchmarking_engine import BenchmarkResult, BenchmarkSummary
 
 class ExportManager:
@@ -17,46 +28,111 @@ class ExportManager:
     
     def __init__(self):
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    @staticmethod
+    def _as(result: BenchmarkResult, cache: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the asdict conversion of a result, cached per object
+
+        asdict deep-copies recursively; when create_export_package runs
+        several exporters over the same results the shared per-call cache
+        keeps it to one conversion per result. The cache is keyed by id and
+        scoped to a single export call - it must never outlive the result
+        objects, or a recycled id would serve another object's rows.
+        """
+        converted = cache.get(id(result))
+        if converted is None:
+            converted = asdict(result)
+            cache[id(result)] = converted
+        return converted
+
+    @staticmethod
+    def _unique_providers(results) -> List[str]:
+        """Collect distinct providers in one pass, preserving first-seen order"""
+        return list(dict.fromkeys(r.provider for r in results))
+
+    def _flat_rows(
+        self,
+        results: List[BenchmarkResult],
+        cache: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Flatten results into rows with metadata_* columns in one pass
+
+        Replaces the json_normalize + concat dance, which materialized the
+        nested metadata column twice and reallocated the whole frame. The
+        shallow copy keeps the cached asdict conversion pristine.
+        """
+        if cache is None:
+            cache = {}
+        rows = []
+        for result in results:
+            row = dict(self._as(result, cache))
+            metadata = row.pop("metadata", None) or {}
+            for key, value in metadata.items():
+                row[f"metadata_{key}"] = value
+            rows.append(row)
+        return rows
     
     def export_results_json(self, results: List[BenchmarkResult], filename: Optional[str] = None) -> str:
         """Export results to JSON format"""
-        
+
         if filename is None:
             filename = f"benchmark_results_{self.timestamp}.json"
-        
-        # Convert results to dictionaries
+
+        with open(filename, 'wb') as f:
+            self._write_results_json(results, f)
+
+        return filename
+
+    def _write_results_json(
+        self,
+        results: List[BenchmarkResult],
+        out,
+        cache: Optional[Dict[int, Dict[str, Any]]] = None
+    ):
+        """Write the results JSON payload to a binary file-like object
+
+        Taking a writable stream lets create_export_package pipe the bytes
+        straight into the zip's DEFLATE sink with no temp file round-trip.
+        """
+        if cache is None:
+            cache = {}
+        # orjson walks dataclass fields in C, so the result objects go in
+        # as-is; the stdlib fallback needs the asdict materialization
         data = {
             "export_info": {
                 "timestamp": datetime.now().isoformat(),
                 "total_results": len(results),
                 "format_version": "1.0"
             },
-            "results": [asdict(result) for result in results]
+            "results": results if orjson is not None else [self._as(result, cache) for result in results]
         }
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        return filename
+
+        if orjson is not None:
+            out.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            out.write(json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
     
     def export_results_csv(self, results: List[BenchmarkResult], filename: Optional[str] = None) -> str:
         """Export results to CSV format"""
         
         if filename is None:
             filename = f"benchmark_results_{self.timestamp}.csv"
-        
-        # Convert to DataFrame
-        df = pd.DataFrame([asdict(result) for result in results])
-        
-        # Flatten metadata column
-        if 'metadata' in df.columns:
-            metadata_df = pd.json_normalize(df['metadata'])
-            metadata_df.columns = [f"metadata_{col}" for col in metadata_df.columns]
-            df = pd.concat([df.drop('metadata', axis=1), metadata_df], axis=1)
-        
-        df.to_csv(filename, index=False, encoding='utf-8')
-        
+
+        with open(filename, 'wb') as f:
+            self._write_results_csv(results, f)
+
         return filename
+
+    def _write_results_csv(
+        self,
+        results: List[BenchmarkResult],
+        out,
+        cache: Optional[Dict[int, Dict[str, Any]]] = None
+    ):
+        """Write the results CSV to a binary file-like object"""
+        # Convert to DataFrame with metadata already flattened
+        df = pd.DataFrame(self._flat_rows(results, cache))
+        df.to_csv(out, index=False, encoding='utf-8')
     
     def export_summary_report(
         self, 
@@ -69,12 +145,35 @@ class ExportManager:
         
         if filename is None:
             filename = f"benchmark_report_{self.timestamp}.json"
-        
-        # Calculate additional statistics
+
+        with open(filename, 'wb', buffering=1 << 20) as f:
+            self._write_summary_report(results, summaries, leaderboard, f)
+
+        return filename
+
+    def _write_summary_report(
+        self,
+        results: List[BenchmarkResult],
+        summaries: Dict[str, BenchmarkSummary],
+        leaderboard: List[Dict[str, Any]],
+        out,
+        cache: Optional[Dict[int, Dict[str, Any]]] = None
+    ):
+        """Write the full summary report to a binary file-like object"""
+        if cache is None:
+            cache = {}
+        # Calculate additional statistics in a single pass over the results
         total_tests = len(results)
-        successful_tests = len([r for r in results if r.success])
-        unique_providers = len(set(r.provider for r in results))
-        unique_samples = len(set(r.sample_id for r in results))
+        successful_tests = 0
+        providers_seen = set()
+        samples_seen = set()
+        for result in results:
+            if result.success:
+                successful_tests += 1
+            providers_seen.add(result.provider)
+            samples_seen.add(result.sample_id)
+        unique_providers = len(providers_seen)
+        unique_samples = len(samples_seen)
         
         # Provider comparison matrix
         comparison_matrix = self._create_comparison_matrix(results)
@@ -85,7 +184,7 @@ class ExportManager:
         # Length category analysis
         length_analysis = self._analyze_by_length(results)
         
-        report_data = {
+        head = {
             "report_info": {
                 "generated_at": datetime.now().isoformat(),
                 "total_tests": total_tests,
@@ -99,14 +198,32 @@ class ExportManager:
             "leaderboard": leaderboard,
             "comparison_matrix": comparison_matrix,
             "category_analysis": category_analysis,
-            "length_analysis": length_analysis,
-            "raw_results": [asdict(result) for result in results]
+            "length_analysis": length_analysis
         }
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
-        
-        return filename
+
+        if orjson is not None:
+            self._stream_json_report(out, head, results)
+        else:
+            head["raw_results"] = [self._as(result, cache) for result in results]
+            out.write(json.dumps(head, indent=2, ensure_ascii=False).encode('utf-8'))
+
+    @staticmethod
+    def _stream_json_report(f, head, results: List[BenchmarkResult]):
+        """Write the report JSON incrementally, one result at a time
+
+        The head (summaries, analyses, leaderboard) is small and encoded in
+        one call; raw_results - the part that scales with suite size - is
+        appended record by record, so peak memory stays one encoded result
+        rather than the whole serialized report.
+        """
+        head_bytes = orjson.dumps(head, option=orjson.OPT_NON_STR_KEYS)
+        f.write(head_bytes[:-1])
+        f.write(b',"raw_results":[')
+        for i, result in enumerate(results):
+            if i:
+                f.write(b',')
+            f.write(orjson.dumps(result))
+        f.write(b']}')
     
     def export_excel_workbook(
         self, 
@@ -116,19 +233,37 @@ class ExportManager:
         filename: Optional[str] = None
     ) -> str:
         """Export results to Excel workbook with multiple sheets"""
-        
+
         if filename is None:
             filename = f"benchmark_results_{self.timestamp}.xlsx"
-        
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            
-            # Raw results sheet
-            results_df = pd.DataFrame([asdict(result) for result in results])
-            if 'metadata' in results_df.columns:
-                metadata_df = pd.json_normalize(results_df['metadata'])
-                metadata_df.columns = [f"metadata_{col}" for col in metadata_df.columns]
-                results_df = pd.concat([results_df.drop('metadata', axis=1), metadata_df], axis=1)
+
+        self._write_excel_workbook(results, summaries, leaderboard, filename)
+        return filename
+
+    def _write_excel_workbook(
+        self,
+        results: List[BenchmarkResult],
+        summaries: Dict[str, BenchmarkSummary],
+        leaderboard: List[Dict[str, Any]],
+        filename: str,
+        cache: Optional[Dict[int, Dict[str, Any]]] = None
+    ):
+        """Write the workbook, sharing the caller's asdict cache if given"""
+        # xlsxwriter's constant_memory mode flushes each row as it is
+        # written instead of building the per-cell style objects openpyxl
+        # keeps in memory, so large Raw Results sheets export in flat memory
+        if xlsxwriter is not None:
+            writer_args = dict(
+                engine='xlsxwriter',
+                engine_kwargs={'options': {'constant_memory': True, 'strings_to_numbers': False}}
+            )
+        else:
+            writer_args = dict(engine='openpyxl')
+
+        with pd.ExcelWriter(filename, **writer_args) as writer:
             
+            # Raw results sheet, metadata already flattened
+            results_df = pd.DataFrame(self._flat_rows(results, cache))
             results_df.to_excel(writer, sheet_name='Raw Results', index=False)
             
             # Summary sheet
@@ -164,249 +299,226 @@ class ExportManager:
             # Latency analysis
             latency_analysis = self._create_latency_analysis_df(results)
             latency_analysis.to_excel(writer, sheet_name='Latency Analysis', index=False)
-        
-        return filename
-    
+
     def create_export_package(
-        self, 
-        results: List[BenchmarkResult], 
+        self,
+        results: List[BenchmarkResult],
         summaries: Dict[str, BenchmarkSummary],
         leaderboard: List[Dict[str, Any]],
         include_formats: List[str] = ["json", "csv", "excel", "report"]
     ) -> str:
         """Create a comprehensive export package as ZIP file"""
-        
+
         package_filename = f"benchmark_package_{self.timestamp}.zip"
-        
-        with zipfile.ZipFile(package_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            
-            # Export in different formats
+
+        # One asdict conversion per result, shared by every member writer;
+        # local to this call so a stale id can never leak into a later export
+        cache: Dict[int, Dict[str, Any]] = {}
+
+        # DEFLATE level 1: the members are repetitive JSON/CSV where level 1
+        # gets nearly the same ratio as the default level 6 at a fraction of
+        # the CPU
+        with zipfile.ZipFile(package_filename, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+
+            # JSON-ish members stream straight into the zip's DEFLATE sink -
+            # no intermediate file is written or read back
             if "json" in include_formats:
-                json_file = self.export_results_json(results)
-                zipf.write(json_file, f"data/{json_file}")
-            
+                with zipf.open(f"data/benchmark_results_{self.timestamp}.json", 'w') as fp:
+                    self._write_results_json(results, fp, cache)
+
             if "csv" in include_formats:
-                csv_file = self.export_results_csv(results)
-                zipf.write(csv_file, f"data/{csv_file}")
-            
+                with zipf.open(f"data/benchmark_results_{self.timestamp}.csv", 'w') as fp:
+                    self._write_results_csv(results, fp, cache)
+
             if "excel" in include_formats:
-                excel_file = self.export_excel_workbook(results, summaries, leaderboard)
-                zipf.write(excel_file, f"data/{excel_file}")
-            
+                # xlsxwriter needs a real (seekable) file to assemble the
+                # workbook container, so this member keeps the temp file;
+                # xlsx is already DEFLATE inside, so store it uncompressed
+                excel_file = f"benchmark_results_{self.timestamp}.xlsx"
+                self._write_excel_workbook(results, summaries, leaderboard, excel_file, cache)
+                zipf.write(excel_file, f"data/{excel_file}", compress_type=zipfile.ZIP_STORED)
+
             if "report" in include_formats:
-                report_file = self.export_summary_report(results, summaries, leaderboard)
-                zipf.write(report_file, f"reports/{report_file}")
+                with zipf.open(f"reports/benchmark_report_{self.timestamp}.json", 'w') as fp:
+                    self._write_summary_report(results, summaries, leaderboard, fp, cache)
             
             # Add metadata file
             metadata = {
                 "package_info": {
                     "created_at": datetime.now().isoformat(),
                     "total_results": len(results),
-                    "providers_tested": list(set(r.provider for r in results)),
+                    "providers_tested": self._unique_providers(results),
                     "included_formats": include_formats,
                     "description": "TTS Benchmarking Results Package"
                 }
             }
             
-            metadata_json = json.dumps(metadata, indent=2)
+            if orjson is not None:
+                metadata_json = orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
+            else:
+                metadata_json = json.dumps(metadata, indent=2)
             zipf.writestr("package_info.json", metadata_json)
-        
+
         return package_filename
-    
+
     def _create_comparison_matrix(self, results: List[BenchmarkResult]) -> Dict[str, Any]:
-        """Create provider comparison matrix"""
-        
-        providers = list(set(r.provider for r in results if r.success))
+        """Create provider comparison matrix
+
+        One pivot aligns every provider's best latency per sample; the
+        pairwise win/loss/tie counts are then NumPy comparisons over the
+        pivot columns, restricted to samples both providers completed.
+        """
+        df = self._results_to_df(results)
+        if df.empty:
+            return {}
+
+        pivot = df.pivot_table(index="sample_id", columns="provider",
+                               values="latency_ms", aggfunc="min")
+        providers = list(pivot.columns)
+        arr = pivot.to_numpy()
+        valid = ~np.isnan(arr)
+
         matrix = {}
-        
-        for provider_a in providers:
+        for i, provider_a in enumerate(providers):
             matrix[provider_a] = {}
-            results_a = [r for r in results if r.provider == provider_a and r.success]
-            
-            for provider_b in providers:
-                if provider_a == provider_b:
+            for j, provider_b in enumerate(providers):
+                if i == j:
                     matrix[provider_a][provider_b] = {"wins": 0, "losses": 0, "ties": 0}
                     continue
-                
-                results_b = [r for r in results if r.provider == provider_b and r.success]
-                
+
                 # Compare on same samples
-                wins = losses = ties = 0
-                
-                for result_a in results_a:
-                    matching_b = [r for r in results_b if r.sample_id == result_a.sample_id]
-                    
-                    for result_b in matching_b:
-                        if result_a.latency_ms < result_b.latency_ms:
-                            wins += 1
-                        elif result_a.latency_ms > result_b.latency_ms:
-                            losses += 1
-                        else:
-                            ties += 1
-                
+                both = valid[:, i] & valid[:, j]
+                a = arr[both, i]
+                b = arr[both, j]
+
                 matrix[provider_a][provider_b] = {
-                    "wins": wins,
-                    "losses": losses,
-                    "ties": ties
+                    "wins": int((a < b).sum()),
+                    "losses": int((a > b).sum()),
+                    "ties": int((a == b).sum())
                 }
-        
+
         return matrix
     
+    @staticmethod
+    def _results_to_df(results: List[BenchmarkResult]) -> pd.DataFrame:
+        """Build the successful-results analysis frame in a single pass
+
+        One walk over the results feeds every analyzer; the groupby
+        aggregations then run in pandas/NumPy C code instead of nested
+        Python accumulation loops.
+        """
+        rows = [
+            (r.provider, r.sample_id, r.latency_ms, r.file_size_bytes,
+             r.metadata.get("category", "unknown"),
+             r.metadata.get("length_category", "unknown"),
+             r.metadata.get("word_count", 0),
+             r.timestamp)
+            for r in results if r.success
+        ]
+        return pd.DataFrame(rows, columns=[
+            "provider", "sample_id", "latency_ms", "file_size_bytes",
+            "category", "length_category", "word_count", "timestamp"
+        ])
+
     def _analyze_by_category(self, results: List[BenchmarkResult]) -> Dict[str, Any]:
         """Analyze performance by text category"""
-        
-        category_stats = {}
-        
-        for result in results:
-            if result.success:
-                category = result.metadata.get("category", "unknown")
-                
-                if category not in category_stats:
-                    category_stats[category] = {
-                        "providers": {},
-                        "total_tests": 0,
-                        "avg_latency": 0,
-                        "latencies": []
-                    }
-                
-                provider = result.provider
-                if provider not in category_stats[category]["providers"]:
-                    category_stats[category]["providers"][provider] = {
-                        "tests": 0,
-                        "avg_latency": 0,
-                        "latencies": []
+
+        df = self._results_to_df(results)
+        if df.empty:
+            return {}
+
+        totals = df.groupby("category")["latency_ms"].agg(["size", "mean"])
+        per_provider = df.groupby(["category", "provider"])["latency_ms"].agg(["size", "mean"])
+
+        return {
+            category: {
+                "providers": {
+                    provider: {
+                        "tests": int(provider_row["size"]),
+                        "avg_latency": float(provider_row["mean"])
                     }
-                
-                category_stats[category]["providers"][provider]["tests"] += 1
-                category_stats[category]["providers"][provider]["latencies"].append(result.latency_ms)
-                category_stats[category]["total_tests"] += 1
-                category_stats[category]["latencies"].append(result.latency_ms)
-        
-        # Calculate averages
-        for category, stats in category_stats.items():
-            if stats["latencies"]:
-                stats["avg_latency"] = sum(stats["latencies"]) / len(stats["latencies"])
-            
-            for provider, provider_stats in stats["providers"].items():
-                if provider_stats["latencies"]:
-                    provider_stats["avg_latency"] = sum(provider_stats["latencies"]) / len(provider_stats["latencies"])
-                # Remove raw latencies to reduce size
-                del provider_stats["latencies"]
-            
-            del stats["latencies"]
-        
-        return category_stats
-    
+                    for provider, provider_row in per_provider.loc[category].iterrows()
+                },
+                "total_tests": int(row["size"]),
+                "avg_latency": float(row["mean"])
+            }
+            for category, row in totals.iterrows()
+        }
+
     def _analyze_by_length(self, results: List[BenchmarkResult]) -> Dict[str, Any]:
         """Analyze performance by text length"""
-        
-        length_stats = {}
-        
-        for result in results:
-            if result.success:
-                length_category = result.metadata.get("length_category", "unknown")
-                word_count = result.metadata.get("word_count", 0)
-                
-                if length_category not in length_stats:
-                    length_stats[length_category] = {
-                        "providers": {},
-                        "total_tests": 0,
-                        "avg_latency": 0,
-                        "avg_word_count": 0,
-                        "latency_per_word": 0,
-                        "latencies": [],
-                        "word_counts": []
-                    }
-                
-                provider = result.provider
-                if provider not in length_stats[length_category]["providers"]:
-                    length_stats[length_category]["providers"][provider] = {
-                        "tests": 0,
-                        "avg_latency": 0,
-                        "avg_latency_per_word": 0,
-                        "latencies": [],
-                        "word_counts": []
+
+        df = self._results_to_df(results)
+        if df.empty:
+            return {}
+
+        totals = df.groupby("length_category").agg(
+            tests=("latency_ms", "size"),
+            avg_latency=("latency_ms", "mean"),
+            avg_word_count=("word_count", "mean")
+        )
+        per_provider = df.groupby(["length_category", "provider"]).agg(
+            tests=("latency_ms", "size"),
+            avg_latency=("latency_ms", "mean"),
+            avg_word_count=("word_count", "mean")
+        )
+
+        return {
+            length_cat: {
+                "providers": {
+                    provider: {
+                        "tests": int(provider_row["tests"]),
+                        "avg_latency": float(provider_row["avg_latency"]),
+                        "avg_latency_per_word": float(
+                            provider_row["avg_latency"] / max(provider_row["avg_word_count"], 1))
                     }
-                
-                length_stats[length_category]["providers"][provider]["tests"] += 1
-                length_stats[length_category]["providers"][provider]["latencies"].append(result.latency_ms)
-                length_stats[length_category]["providers"][provider]["word_counts"].append(word_count)
-                
-                length_stats[length_category]["total_tests"] += 1
-                length_stats[length_category]["latencies"].append(result.latency_ms)
-                length_stats[length_category]["word_counts"].append(word_count)
-        
-        # Calculate averages
-        for length_cat, stats in length_stats.items():
-            if stats["latencies"]:
-                stats["avg_latency"] = sum(stats["latencies"]) / len(stats["latencies"])
-                stats["avg_word_count"] = sum(stats["word_counts"]) / len(stats["word_counts"])
-                stats["latency_per_word"] = stats["avg_latency"] / max(stats["avg_word_count"], 1)
-            
-            for provider, provider_stats in stats["providers"].items():
-                if provider_stats["latencies"]:
-                    provider_stats["avg_latency"] = sum(provider_stats["latencies"]) / len(provider_stats["latencies"])
-                    avg_words = sum(provider_stats["word_counts"]) / len(provider_stats["word_counts"])
-                    provider_stats["avg_latency_per_word"] = provider_stats["avg_latency"] / max(avg_words, 1)
-                
-                # Remove raw data to reduce size
-                del provider_stats["latencies"]
-                del provider_stats["word_counts"]
-            
-            del stats["latencies"]
-            del stats["word_counts"]
-        
-        return length_stats
+                    for provider, provider_row in per_provider.loc[length_cat].iterrows()
+                },
+                "total_tests": int(row["tests"]),
+                "avg_latency": float(row["avg_latency"]),
+                "avg_word_count": float(row["avg_word_count"]),
+                "latency_per_word": float(row["avg_latency"] / max(row["avg_word_count"], 1))
+            }
+            for length_cat, row in totals.iterrows()
+        }
     
     def _create_success_analysis_df(self, results: List[BenchmarkResult]) -> pd.DataFrame:
         """Create success rate analysis DataFrame"""
-        
-        analysis_data = []
-        
-        # Group by provider
-        providers = set(r.provider for r in results)
-        
-        for provider in providers:
-            provider_results = [r for r in results if r.provider == provider]
-            total = len(provider_results)
-            successful = len([r for r in provider_results if r.success])
-            
-            # By category
-            categories = set(r.metadata.get("category", "unknown") for r in provider_results)
-            
-            for category in categories:
-                category_results = [r for r in provider_results if r.metadata.get("category") == category]
-                cat_total = len(category_results)
-                cat_successful = len([r for r in category_results if r.success])
-                
-                analysis_data.append({
-                    "provider": provider,
-                    "category": category,
-                    "total_tests": cat_total,
-                    "successful_tests": cat_successful,
-                    "success_rate": (cat_successful / cat_total * 100) if cat_total > 0 else 0,
-                    "failure_rate": ((cat_total - cat_successful) / cat_total * 100) if cat_total > 0 else 0
-                })
-        
+
+        # Accumulate (provider, category) totals in a single pass instead of
+        # re-filtering the result list once per provider and per category
+        counts: Dict[tuple, list] = {}
+        for result in results:
+            key = (result.provider, result.metadata.get("category", "unknown"))
+            entry = counts.setdefault(key, [0, 0])
+            entry[0] += 1
+            if result.success:
+                entry[1] += 1
+
+        analysis_data = [
+            {
+                "provider": provider,
+                "category": category,
+                "total_tests": cat_total,
+                "successful_tests": cat_successful,
+                "success_rate": (cat_successful / cat_total * 100) if cat_total > 0 else 0,
+                "failure_rate": ((cat_total - cat_successful) / cat_total * 100) if cat_total > 0 else 0
+            }
+            for (provider, category), (cat_total, cat_successful) in counts.items()
+        ]
+
         return pd.DataFrame(analysis_data)
     
     def _create_latency_analysis_df(self, results: List[BenchmarkResult]) -> pd.DataFrame:
         """Create latency analysis DataFrame"""
-        
-        analysis_data = []
-        successful_results = [r for r in results if r.success]
-        
-        # Group by provider and category
-        for result in successful_results:
-            analysis_data.append({
-                "provider": result.provider,
-                "category": result.metadata.get("category", "unknown"),
-                "length_category": result.metadata.get("length_category", "unknown"),
-                "word_count": result.metadata.get("word_count", 0),
-                "latency_ms": result.latency_ms,
-                "latency_per_word": result.latency_ms / max(result.metadata.get("word_count", 1), 1),
-                "file_size_kb": result.file_size_bytes / 1024,
-                "timestamp": result.timestamp
-            })
-        
-        return pd.DataFrame(analysis_data)
+
+        # The derived columns are vectorized arithmetic over the shared
+        # analysis frame
+        df = self._results_to_df(results)
+        df["latency_per_word"] = df["latency_ms"] / np.maximum(df["word_count"], 1)
+        df["file_size_kb"] = df["file_size_bytes"] / 1024
+
+        return df[[
+            "provider", "category", "length_category", "word_count",
+            "latency_ms", "latency_per_word", "file_size_kb", "timestamp"
+        ]]
@@ -2,92 +2,121 @@
 Geolocation utilities for tracking test locations
 """
 import requests
+import string
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Optional
 import json
 
+# Every two-letter code mapped to its flag emoji once at import time
+# (regional indicator symbols start at U+1F1E6 for 'A')
+_FLAGS = {
+    a + b: chr(0x1F1E6 + ord(a) - 65) + chr(0x1F1E6 + ord(b) - 65)
+    for a in string.ascii_uppercase for b in string.ascii_uppercase
+}
+_FLAGS['XX'] = '🌍'  # Placeholder code used when no service answered
+
+def _parse_ipapi(data: Dict) -> Optional[Dict[str, str]]:
+    """Parse an ipapi.co response (reliable, no key needed)"""
+    if data.get('country_name') and data.get('country_name') != 'Unknown':
+        return {
+            'country': data.get('country_name', 'Unknown'),
+            'country_code': data.get('country_code', 'XX'),
+            'region': data.get('region', 'Unknown'),
+            'city': data.get('city', 'Unknown'),
+            'latitude': str(data.get('latitude', 0)),
+            'longitude': str(data.get('longitude', 0)),
+            'timezone': data.get('timezone', 'UTC'),
+            'ip': data.get('ip', 'Unknown')
+        }
+    return None
+
+def _parse_ip_api(data: Dict) -> Optional[Dict[str, str]]:
+    """Parse an ip-api.com response (backup, free)"""
+    if data.get('status') == 'success' and data.get('country'):
+        return {
+            'country': data.get('country', 'Unknown'),
+            'country_code': data.get('countryCode', 'XX'),
+            'region': data.get('regionName', 'Unknown'),
+            'city': data.get('city', 'Unknown'),
+            'latitude': str(data.get('lat', 0)),
+            'longitude': str(data.get('lon', 0)),
+            'timezone': data.get('timezone', 'UTC'),
+            'ip': data.get('query', 'Unknown')
+        }
+    return None
+
+def _parse_ipinfo(data: Dict) -> Optional[Dict[str, str]]:
+    """Parse an ipinfo.io response (another backup)"""
+    if data.get('country'):
+        # Parse location string like "37.7749,-122.4194"
+        loc_parts = data.get('loc', '0,0').split(',')
+        return {
+            'country': data.get('country', 'Unknown'),
+            'country_code': data.get('country', 'XX'),
+            'region': data.get('region', 'Unknown'),
+            'city': data.get('city', 'Unknown'),
+            'latitude': loc_parts[0] if len(loc_parts) > 0 else '0',
+            'longitude': loc_parts[1] if len(loc_parts) > 1 else '0',
+            'timezone': data.get('timezone', 'UTC'),
+            'ip': data.get('ip', 'Unknown')
+        }
+    return None
+
+# Probed concurrently; the first service to answer with a usable
+# location wins, so a slow or down service no longer adds its full
+# timeout to the wall-clock for a cache miss
+_PROBES = [
+    ('https://ipapi.co/json/', _parse_ipapi),
+    ('http://ip-api.com/json/', _parse_ip_api),
+    ('https://ipinfo.io/json', _parse_ipinfo),
+]
+
 class GeolocationService:
     """Service to get geolocation information"""
-    
+
     def __init__(self):
         self.cache = {}
-    
+        self._last_cc = None
+
+    @staticmethod
+    def _probe(url: str, parser) -> Optional[Dict[str, str]]:
+        """Query one geolocation service and parse its response"""
+        response = requests.get(url, timeout=5)
+        if response.status_code != 200:
+            return None
+        return parser(response.json())
+
     def get_location(self, force_refresh: bool = False) -> Dict[str, str]:
         """
         Get current geolocation based on IP address.
         """
-        
+
         # Check cache first (unless forced refresh)
         if not force_refresh and 'location' in self.cache:
             return self.cache['location']
-        
-        # Try multiple geolocation services in order
-        location = None
-        
-        # Service 1: ipapi.co (reliable, no key needed)
-        try:
-            response = requests.get('https://ipapi.co/json/', timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('country_name') and data.get('country_name') != 'Unknown':
-                    location = {
-                        'country': data.get('country_name', 'Unknown'),
-                        'country_code': data.get('country_code', 'XX'),
-                        'region': data.get('region', 'Unknown'),
-                        'city': data.get('city', 'Unknown'),
-                        'latitude': str(data.get('latitude', 0)),
-                        'longitude': str(data.get('longitude', 0)),
-                        'timezone': data.get('timezone', 'UTC'),
-                        'ip': data.get('ip', 'Unknown')
-                    }
-                    self.cache['location'] = location
-                    return location
-        except Exception as e:
-            print(f"ipapi.co failed: {e}")
-        
-        # Service 2: ip-api.com (backup, free)
-        try:
-            response = requests.get('http://ip-api.com/json/', timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('status') == 'success' and data.get('country'):
-                    location = {
-                        'country': data.get('country', 'Unknown'),
-                        'country_code': data.get('countryCode', 'XX'),
-                        'region': data.get('regionName', 'Unknown'),
-                        'city': data.get('city', 'Unknown'),
-                        'latitude': str(data.get('lat', 0)),
-                        'longitude': str(data.get('lon', 0)),
-                        'timezone': data.get('timezone', 'UTC'),
-                        'ip': data.get('query', 'Unknown')
-                    }
-                    self.cache['location'] = location
-                    return location
-        except Exception as e:
-            print(f"ip-api.com failed: {e}")
-        
-        # Service 3: ipinfo.io (another backup)
+
+        # Race all services concurrently and keep the first usable answer
+        pool = ThreadPoolExecutor(max_workers=len(_PROBES))
         try:
-            response = requests.get('https://ipinfo.io/json', timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('country'):
-                    # Parse location string like "37.7749,-122.4194"
-                    loc_parts = data.get('loc', '0,0').split(',')
-                    location = {
-                        'country': data.get('country', 'Unknown'),
-                        'country_code': data.get('country', 'XX'),
-                        'region': data.get('region', 'Unknown'),
-                        'city': data.get('city', 'Unknown'),
-                        'latitude': loc_parts[0] if len(loc_parts) > 0 else '0',
-                        'longitude': loc_parts[1] if len(loc_parts) > 1 else '0',
-                        'timezone': data.get('timezone', 'UTC'),
-                        'ip': data.get('ip', 'Unknown')
-                    }
+            futures = {
+                pool.submit(self._probe, url, parser): url
+                for url, parser in _PROBES
+            }
+            for future in as_completed(futures):
+                try:
+                    location = future.result()
+                except Exception as e:
+                    print(f"{futures[future]} failed: {e}")
+                    continue
+                if location:
                     self.cache['location'] = location
+                    self._last_cc = location.get('country_code')
                     return location
-        except Exception as e:
-            print(f"ipinfo.io failed: {e}")
-        
+        finally:
+            # Don't block on the losers; their requests finish (or time
+            # out) in the background
+            pool.shutdown(wait=False, cancel_futures=True)
+
         # Return default if all services fail
         return {
             'country': 'Unknown',
@@ -99,15 +128,15 @@ class GeolocationService:
             'timezone': 'UTC',
             'ip': 'Unknown'
         }
-    
+
     def get_location_string(self) -> str:
         """Get location as a formatted string"""
         try:
             location = self.get_location()
-            
+
             if not location or not isinstance(location, dict):
                 return 'Unknown'
-            
+
             parts = []
             if location.get('city') and location.get('city') != 'Unknown':
                 parts.append(location['city'])
@@ -115,34 +144,31 @@ class GeolocationService:
                 parts.append(location['region'])
             if location.get('country') and location.get('country') != 'Unknown':
                 parts.append(location['country'])
-            
+
             if parts:
                 return ', '.join(parts)
             return 'Unknown'
         except Exception as e:
             print(f"Error getting location string: {e}")
             return 'Unknown'
-    
+
     def get_country_flag(self, country_code: str = None) -> str:
         """Get country flag emoji from country code"""
         try:
+            if country_code is None:
+                # Reuse the code from the last successful lookup before
+                # falling back to a full get_location round trip
+                country_code = self._last_cc
             if country_code is None:
                 location = self.get_location()
                 if not location or not isinstance(location, dict):
                     return '🌍'
                 country_code = location.get('country_code', 'XX')
-            
-            if not country_code or country_code == 'XX' or country_code == 'Unknown':
-                return '🌍'
-            
-            # Convert country code to flag emoji
-            # Each letter is converted to its regional indicator symbol
-            flag = ''.join(chr(ord(c) + 127397) for c in country_code.upper())
-            return flag
+
+            return _FLAGS.get((country_code or 'XX').upper(), '🌍')
         except Exception as e:
             print(f"Error getting country flag: {e}")
             return '🌍'
 
 # Global instance
 geo_service = GeolocationService()
-
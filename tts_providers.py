@@ -1389,18 +1389,27 @@ class SarvamTTSProvider(TTSProvider):
 
 class TTSProviderFactory:
     """Factory for creating TTS providers"""
-    
-    @staticmethod
-    def create_provider(provider_id: str) -> TTSProvider:
-        """Create a TTS provider instance"""
-        if provider_id == "murf_falcon_oct23":
-            return MurfFalconOct23TTSProvider()
-        elif provider_id == "elevenlabs":
-            return ElevenLabsTTSProvider()
-        elif provider_id == "cartesia_sonic3":
-            return CartesiaSonic3Provider()
-        else:
-            raise ValueError(f"Unknown provider: {provider_id}")
+
+    # Providers are stateless between requests (config and API key only),
+    # so one shared instance per provider id serves every caller instead of
+    # re-running construction and key lookup each time
+    _instances: Dict[str, TTSProvider] = {}
+
+    @classmethod
+    def create_provider(cls, provider_id: str) -> TTSProvider:
+        """Return the shared TTS provider instance, creating it on first use"""
+        provider = cls._instances.get(provider_id)
+        if provider is None:
+            if provider_id == "murf_falcon_oct23":
+                provider = MurfFalconOct23TTSProvider()
+            elif provider_id == "elevenlabs":
+                provider = ElevenLabsTTSProvider()
+            elif provider_id == "cartesia_sonic3":
+                provider = CartesiaSonic3Provider()
+            else:
+                raise ValueError(f"Unknown provider: {provider_id}")
+            cls._instances[provider_id] = provider
+        return provider
     
     @staticmethod
     def get_available_providers() -> list: